@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from db import SessionLocal
+from models import LLMCacheEntry
+from config import settings
+
+
+def cache_key(model_name: str, schema, messages: list) -> str:
+    """Content address of a structured call: model + output schema + normalized messages."""
+    normalized = [
+        {
+            "role": m.get("role"),
+            "content": re.sub(r"\s+", " ", str(m.get("content", ""))).strip(),
+        }
+        for m in messages
+    ]
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "schema": schema.model_json_schema(),
+            "messages": normalized,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoryTier:
+    """In-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict):
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class PostgresTier:
+    """Shared across workers; pruned of expired and excess rows every ``prune_every`` writes."""
+
+    def __init__(self, max_rows: int, ttl_seconds: int, prune_every: int = 100):
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self.prune_every = prune_every
+        self.writes = 0
+
+    def get(self, key: str):
+        with SessionLocal() as db:
+            entry = db.execute(
+                select(LLMCacheEntry).where(
+                    LLMCacheEntry.key == key,
+                    LLMCacheEntry.expires_at > datetime.now(timezone.utc),
+                )
+            ).scalar_one_or_none()
+            if entry is None:
+                return None
+            entry.hits += 1
+            db.commit()
+            return entry.response
+
+    def set(self, key: str, value: dict, model_name: str, schema_name: str):
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        with SessionLocal() as db:
+            db.execute(
+                insert(LLMCacheEntry)
+                .values(
+                    key=key,
+                    model=model_name,
+                    schema=schema_name,
+                    response=value,
+                    hits=0,
+                    created_at=now,
+                    expires_at=expires_at,
+                )
+                .on_conflict_do_update(
+                    index_elements=[LLMCacheEntry.key],
+                    set_={"response": value, "created_at": now, "expires_at": expires_at},
+                )
+            )
+            self.writes += 1
+            if self.writes % self.prune_every == 0:
+                self.prune(db)
+            db.commit()
+
+    def prune(self, db):
+        db.execute(
+            delete(LLMCacheEntry).where(
+                LLMCacheEntry.expires_at <= datetime.now(timezone.utc)
+            )
+        )
+        excess = (
+            select(LLMCacheEntry.key)
+            .order_by(LLMCacheEntry.created_at.desc())
+            .offset(self.max_rows)
+        )
+        db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(excess)))
+
+
+class FileTier:
+    """One JSON file per key; for single-host deployments without the shared table.
+
+    Like PostgresTier it is pruned every ``prune_every`` writes rather than on
+    each one: expired files go, and past ``max_files`` the oldest are removed
+    down to 90% of it. Other writers, in this process or another, may remove
+    the same files meanwhile; a file already gone is simply skipped.
+    """
+
+    def __init__(self, directory: str, max_files: int, ttl_seconds: int, prune_every: int = 100):
+        self.directory = directory
+        self.max_files = max_files
+        self.ttl_seconds = ttl_seconds
+        self.prune_every = prune_every
+        self.writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry["expires_at"] < time.time():
+            self._remove(self._path(key))
+            return None
+        return entry["response"]
+
+    def set(self, key: str, value: dict, model_name: str, schema_name: str):
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"expires_at": time.time() + self.ttl_seconds, "response": value}, f)
+        os.replace(tmp_path, self._path(key))
+
+        self.writes += 1
+        if self.writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self):
+        # a file's mtime is when it was written, so it expires ttl_seconds later
+        expired_before = time.time() - self.ttl_seconds
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if mtime < expired_before:
+                    self._remove(entry.path)
+                else:
+                    files.append((mtime, entry.path))
+        if len(files) > self.max_files:
+            files.sort()
+            for _, path in files[: len(files) - int(self.max_files * 0.9)]:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class LLMCache:
+    def __init__(self, memory: MemoryTier, persistent=None, nodes: set[str] = frozenset()):
+        self.memory = memory
+        self.persistent = persistent
+        self.nodes = nodes
+        self.counters = defaultdict(lambda: {"memory_hits": 0, "persistent_hits": 0, "misses": 0})
+
+    def enabled_for(self, node: str) -> bool:
+        return node in self.nodes
+
+    async def get(self, key: str, node: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters[node]["memory_hits"] += 1
+            return value
+
+        if self.persistent is not None:
+            try:
+                value = await asyncio.to_thread(self.persistent.get, key)
+            except Exception as e:
+                print(f"LLM cache read failed: {e}")
+            if value is not None:
+                self.counters[node]["persistent_hits"] += 1
+                self.memory.set(key, value)
+                return value
+
+        self.counters[node]["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: dict, model_name: str, schema_name: str):
+        self.memory.set(key, value)
+        if self.persistent is not None:
+            try:
+                await asyncio.to_thread(
+                    self.persistent.set, key, value, model_name, schema_name
+                )
+            except Exception as e:
+                print(f"LLM cache write failed: {e}")
+
+    def stats(self) -> dict:
+        totals = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+        for counts in self.counters.values():
+            for name, count in counts.items():
+                totals[name] += count
+        lookups = sum(totals.values())
+        return {
+            **totals,
+            "hit_rate": round((lookups - totals["misses"]) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory.entries),
+            "by_node": dict(self.counters),
+        }
+
+
+def build_cache() -> LLMCache:
+    persistent = None
+    if settings.LLM_CACHE_BACKEND == "postgres":
+        persistent = PostgresTier(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
+    elif settings.LLM_CACHE_BACKEND == "file":
+        persistent = FileTier(
+            settings.LLM_CACHE_DIR,
+            settings.LLM_CACHE_MAX_ENTRIES,
+            settings.LLM_CACHE_TTL_SECONDS,
+        )
+
+    return LLMCache(
+        memory=MemoryTier(
+            settings.LLM_CACHE_MEMORY_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS
+        ),
+        persistent=persistent,
+        nodes=set(settings.LLM_CACHE_NODES),
+    )
@@ -1,17 +1,56 @@
-from psycopg_pool import ConnectionPool
-from langgraph.checkpoint.postgres import PostgresSaver
-from db import DATABASE_URL
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from db import DATABASE_URL, POOL_SIZES
+from config import settings
 
 connection_kwargs = {
     "autocommit": True,
     "prepare_threshold": 0,
+    "row_factory": dict_row,
 }
 
-pool = ConnectionPool(
+# Opened and closed by the app lifespan; every worker process shares the same
+# checkpoint tables, so any of them can resume any thread_id. Its size is the
+# checkpointer's share of DB_POOL_BUDGET (see db.pool_sizes).
+pool = AsyncConnectionPool(
     conninfo=DATABASE_URL,
-    max_size=20,
+    min_size=1,
+    max_size=POOL_SIZES["checkpointer"],
+    timeout=settings.DB_POOL_TIMEOUT,
     kwargs=connection_kwargs,
     open=False,
+    name="checkpointer",
 )
 
-checkpointer = PostgresSaver(pool)
+
+async def open_checkpointer() -> AsyncPostgresSaver:
+    # the saver binds to the running event loop, so it can only be built here
+    await pool.open()
+    checkpointer = AsyncPostgresSaver(pool)
+    await checkpointer.setup()
+    return checkpointer
+
+
+async def close_checkpointer():
+    await pool.close()
+
+
+def stats() -> dict:
+    """The checkpointer pool in the same terms as db.monitors; psycopg keeps
+    the counters itself."""
+    raw = pool.get_stats()
+    size = raw.get("pool_max", pool.max_size)
+    in_use = raw.get("pool_size", 0) - raw.get("pool_available", 0)
+    requests = raw.get("requests_num", 0)
+    return {
+        "size": size,
+        "in_use": in_use,
+        "saturation": round(in_use / size, 3) if size else 0.0,
+        "checkouts": requests,
+        "exhausted": raw.get("requests_queued", 0),
+        "timeouts": raw.get("requests_errors", 0),
+        "waiting": raw.get("requests_waiting", 0),
+        "wait_avg_ms": round(raw.get("requests_wait_ms", 0) / requests, 2) if requests else 0.0,
+        "usage_avg_ms": round(raw.get("usage_ms", 0) / requests, 2) if requests else 0.0,
+    }
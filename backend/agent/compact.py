@@ -0,0 +1,109 @@
+"""Compact, deterministic text for the models and lists that go into prompts.
+
+Prompt builders assemble a user prompt from ``(priority, text)`` parts and pass
+them through ``fit`` with their node name. When the node has a budget in
+PROMPT_TOKEN_BUDGETS, the lowest-priority parts are dropped until the prompt
+fits (later parts first on ties). Parts with priority REQUIRED are never
+dropped.
+"""
+
+from bs4 import BeautifulSoup
+from agent.llm import estimate_tokens
+from schemas import JDResponseSchema, Project, Experience, SkillCategory
+from config import settings
+
+REQUIRED = 99
+
+
+def compact_list(items) -> str:
+    if isinstance(items, (set, frozenset)):
+        items = sorted(items)
+    return ", ".join(str(i) for i in items) or "none"
+
+
+def compact_html(html: str) -> str:
+    """Visible text of a JD page, one line per block."""
+    text = BeautifulSoup(html or "", "html.parser").get_text("\n")
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def jd_parts(jd, detail: int = 2) -> list[tuple[int, str]]:
+    """The JD, most to least useful: keywords and must-haves, nice-to-haves,
+    responsibilities, location. ``detail`` is the priority of the top part."""
+    jd = JDResponseSchema.model_validate(jd)
+    parts = [
+        (detail, f"Keywords: {compact_list(jd.keywords)}"),
+        (detail, f"Must have: {compact_list(jd.must_have_qualifications)}"),
+        (detail - 1, f"Nice to have: {compact_list(jd.nice_to_have_qualifications)}"),
+    ]
+    if jd.responsibilities:
+        parts.append(
+            (detail - 2, "Responsibilities:\n" + "\n".join(f"- {r}" for r in jd.responsibilities))
+        )
+    if jd.location:
+        parts.append((detail - 2, f"Location: {jd.location}"))
+    return parts
+
+
+def compact_project(project) -> str:
+    p = Project.model_validate(project)
+    header = p.title
+    if p.technologies:
+        header += f" | tech: {compact_list(p.technologies)}"
+    if p.link:
+        header += f" | link: {p.link}"
+    lines = [header]
+    if p.description:
+        lines.append(p.description)
+    lines += [f"- {b}" for b in p.bullets]
+    return "\n".join(lines)
+
+
+def project_parts(project, index: int, detail: int = 1) -> list[tuple[int, str]]:
+    """An indexed project whose header always stays; the rest can be trimmed."""
+    header, _, body = compact_project(project).partition("\n")
+    parts = [(REQUIRED, f"[{index}] {header}")]
+    if body:
+        parts.append((detail, body))
+    return parts
+
+
+def compact_experience(experience) -> str:
+    e = Experience.model_validate(experience)
+    header = f"{e.role} @ {e.company}"
+    if e.location:
+        header += f" | {e.location}"
+    if e.start_date or e.end_date:
+        header += f" | {e.start_date or '?'} - {e.end_date or 'present'}"
+    if e.technologies:
+        header += f" | tech: {compact_list(e.technologies)}"
+    lines = [header]
+    if e.description:
+        lines.append(e.description)
+    lines += [f"- {b}" for b in e.bullets]
+    return "\n".join(lines)
+
+
+def compact_skills(categories) -> str:
+    return "\n".join(
+        f"{c.category}: {compact_list(c.skills)}"
+        for c in (SkillCategory.model_validate(c) for c in categories)
+    )
+
+
+def fit(parts: list[tuple[int, str]], node: str) -> str:
+    budget = settings.PROMPT_TOKEN_BUDGETS.get(node)
+    kept = list(range(len(parts)))
+
+    def size():
+        return estimate_tokens([{"content": "\n".join(parts[i][1] for i in kept)}])
+
+    if budget:
+        # lowest priority first, and the later of two equal parts first
+        for i in sorted(kept, key=lambda i: (parts[i][0], -i)):
+            if size() <= budget:
+                break
+            if parts[i][0] < REQUIRED:
+                kept.remove(i)
+
+    return "\n".join(parts[i][1] for i in kept)
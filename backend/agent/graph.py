@@ -9,16 +9,18 @@ from agent.nodes import (
     skill_selection_review_node,
     continue_to_project_rewrite_node,
     execute_project_rewrite_node,
+    continue_to_experience_draft_node,
+    experience_draft_node,
     continue_to_experience_rewrite_node,
     execute_experience_rewrite_node,
+    batch_experience_rewrite_node,
     assemble_resume_node,
 )
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver
 from agent.state import TailorState
+from config import settings
 
 tailor_graph = StateGraph(TailorState)
-checkpointer = InMemorySaver()
 
 tailor_graph.add_node("jd_parsing_node", jd_parsing_node)
 tailor_graph.add_node("skill_match_node", skill_match_node)
@@ -34,8 +36,29 @@ tailor_graph.add_node(
 tailor_graph.add_node("assemble_resume_node", assemble_resume_node)
 
 tailor_graph.add_edge(START, "jd_parsing_node")
+
+# Skill matching, project selection and the experience drafts only need
+# jd_json, so they run side by side in the superstep after JD parsing.
 tailor_graph.add_edge("jd_parsing_node", "skill_match_node")
-tailor_graph.add_edge("skill_match_node", "project_selection_node")
+tailor_graph.add_edge("skill_match_node", END)
+tailor_graph.add_edge("jd_parsing_node", "project_selection_node")
+
+if settings.EXPERIENCE_REWRITE_MODE == "batched":
+    # one call drafts every entry
+    tailor_graph.add_node("batch_experience_rewrite_node", batch_experience_rewrite_node)
+    tailor_graph.add_edge("jd_parsing_node", "batch_experience_rewrite_node")
+    tailor_graph.add_edge("batch_experience_rewrite_node", END)
+else:
+    tailor_graph.add_node("experience_draft_node", experience_draft_node)
+    tailor_graph.add_conditional_edges(
+        "jd_parsing_node",
+        continue_to_experience_draft_node,
+        ["experience_draft_node"],
+    )
+    tailor_graph.add_edge("experience_draft_node", END)
+
+# The reviews keep their original order. Whatever a review depends on has
+# already finished in the parallel superstep above.
 tailor_graph.add_edge("project_selection_node", "project_selection_review_node")
 tailor_graph.add_conditional_edges(
     "project_selection_review_node",
@@ -49,6 +72,7 @@ tailor_graph.add_conditional_edges(
     ["execute_project_rewrite_node"],
 )
 tailor_graph.add_edge("execute_project_rewrite_node", "project_join_node")
+# every entry already has its draft, so each subgraph starts at its review
 tailor_graph.add_conditional_edges(
     "project_join_node",
     continue_to_experience_rewrite_node,
@@ -57,4 +81,5 @@ tailor_graph.add_conditional_edges(
 tailor_graph.add_edge("execute_experience_rewrite_node", "assemble_resume_node")
 tailor_graph.add_edge("assemble_resume_node", END)
 
-tailor_agent = tailor_graph.compile(checkpointer=checkpointer)
+# the Postgres checkpointer is attached in the app lifespan once the pool is open
+tailor_agent = tailor_graph.compile()
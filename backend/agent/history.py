@@ -0,0 +1,68 @@
+from config import settings
+
+FEEDBACK_SUMMARY_HEADER = "Earlier feedback, already applied to the latest draft:"
+
+
+def _is_summary(message: dict) -> bool:
+    return message.get("role") == "user" and str(message.get("content", "")).startswith(
+        FEEDBACK_SUMMARY_HEADER
+    )
+
+
+def _summary_items(message: dict) -> list[str]:
+    lines = str(message["content"]).splitlines()[1:]
+    return [line[2:] for line in lines if line.startswith("- ")]
+
+
+def compact_history(messages: list) -> list:
+    """System prompt, original input, feedback summary, latest draft, pending feedback.
+
+    Every feedback turn that a later draft has answered is folded into one
+    summary message (the most recent MESSAGE_HISTORY_FEEDBACK_ITEMS notes, each
+    cut to MESSAGE_HISTORY_FEEDBACK_CHARS), and only the newest assistant draft
+    is kept, so a retry costs the same however many rounds came before it.
+    """
+    if len(messages) <= 4:
+        return messages
+
+    head, rest = messages[:2], messages[2:]
+    pending = None
+    if rest[-1].get("role") == "user" and not _is_summary(rest[-1]):
+        pending = rest.pop()
+
+    feedback = []
+    latest_draft = None
+    for message in rest:
+        if _is_summary(message):
+            feedback += _summary_items(message)
+        elif message.get("role") == "user":
+            feedback.append(str(message.get("content", "")))
+        else:
+            latest_draft = message
+
+    limit = settings.MESSAGE_HISTORY_FEEDBACK_CHARS
+    feedback = [
+        " ".join(note.split())[:limit]
+        for note in feedback[-settings.MESSAGE_HISTORY_FEEDBACK_ITEMS :]
+    ]
+
+    history = list(head)
+    if feedback:
+        history.append(
+            {
+                "role": "user",
+                "content": "\n".join(
+                    [FEEDBACK_SUMMARY_HEADER] + [f"- {note}" for note in feedback]
+                ),
+            }
+        )
+    if latest_draft:
+        history.append(latest_draft)
+    if pending:
+        history.append(pending)
+    return history
+
+
+def bounded_history(left: list, right: list) -> list:
+    """State reducer used in place of operator.add for the feedback loops."""
+    return compact_history((left or []) + (right or []))
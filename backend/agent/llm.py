@@ -0,0 +1,120 @@
+import time
+from langchain.chat_models import init_chat_model
+from langchain_core.utils.json import parse_partial_json
+from langgraph.config import get_config
+from agent.scheduler import LLMScheduler
+from agent.cache import build_cache, cache_key
+from agent import usage
+from config import settings
+
+MODEL_NAME = "gpt-5-nano"
+
+model = init_chat_model(MODEL_NAME)
+
+scheduler = LLMScheduler(
+    max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+)
+
+cache = build_cache()
+
+
+class StructuredModel:
+    """The shared chat model bound to one output schema."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.model_name = MODEL_NAME
+        self.runnable = model.with_structured_output(schema, include_raw=True)
+        # the bare model with the schema's response format, for partial output
+        self.streaming = model.with_structured_output(schema).first
+
+    async def ainvoke(self, messages: list):
+        """Returns (parsed response, provider usage metadata)."""
+        result = await self.runnable.ainvoke(messages)
+        if result["parsing_error"]:
+            raise result["parsing_error"]
+        return result["parsed"], result["raw"].usage_metadata
+
+    async def astream(self, messages: list, on_partial):
+        """Like ``ainvoke``, awaiting ``on_partial(dict)`` each time the JSON grows.
+
+        The final response is parsed from the same text that was streamed.
+        """
+        aggregate = None
+        last = None
+        async for chunk in self.streaming.astream(messages):
+            aggregate = chunk if aggregate is None else aggregate + chunk
+            partial = parse_partial_json(aggregate.text) if aggregate.text else None
+            if partial and partial != last:
+                last = partial
+                await on_partial(partial)
+        return self.schema.model_validate_json(aggregate.text), aggregate.usage_metadata
+
+
+def estimate_tokens(messages: list) -> int:
+    # ~4 characters per token is close enough for budgeting
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4 + 1
+
+
+def current_thread_id() -> str:
+    try:
+        return get_config()["configurable"].get("thread_id", "default")
+    except RuntimeError:
+        return "default"
+
+
+async def call_model(
+    structured_model, messages: list, node: str, iteration: int = 1, on_partial=None
+):
+    """Every node goes through here so the scheduler sees all provider traffic.
+
+    Nodes listed in LLM_CACHE_NODES are answered from the response cache when
+    the same model, schema and (normalized) messages were seen before. Each
+    call, cached or not, is recorded in the usage table under the run's
+    application, ``node`` and ``iteration``. With ``on_partial`` the answer is
+    streamed (STREAM_REWRITES) and the callback sees every partial object.
+    """
+    thread_id = current_thread_id()
+    key = None
+    if cache.enabled_for(node):
+        key = cache_key(structured_model.model_name, structured_model.schema, messages)
+        cached = await cache.get(key, node)
+        if cached is not None:
+            await usage.record(
+                thread_id,
+                node,
+                iteration,
+                structured_model.model_name,
+                usage=None,
+                latency_ms=0,
+                cache_hit=True,
+            )
+            return structured_model.schema.model_validate(cached)
+
+    async with scheduler.slot(thread_id, estimate_tokens(messages)):
+        started = time.perf_counter()
+        if on_partial and settings.STREAM_REWRITES and hasattr(structured_model, "astream"):
+            response, usage_metadata = await structured_model.astream(messages, on_partial)
+        else:
+            response, usage_metadata = await structured_model.ainvoke(messages)
+        latency_ms = round((time.perf_counter() - started) * 1000)
+
+    await usage.record(
+        thread_id,
+        node,
+        iteration,
+        structured_model.model_name,
+        usage=usage_metadata,
+        latency_ms=latency_ms,
+    )
+
+    if key is not None:
+        await cache.set(
+            key,
+            response.model_dump(mode="json"),
+            structured_model.model_name,
+            structured_model.schema.__name__,
+        )
+    return response
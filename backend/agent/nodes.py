@@ -1,18 +1,23 @@
-from langchain.chat_models import init_chat_model
 from schemas import (
     JDResponseSchema,
     SemanticMatchResponseSchema,
     ProjectSelectResponseSchema,
     SkillSelectionResponse,
     SkillMatchResultSchema,
+    BatchExperienceRewriteResponse,
     HumanReviewResponse,
     SkillCategory,
     Project,
     Experience,
 )
 from agent.state import TailorState
+from agent.llm import StructuredModel, call_model, current_thread_id
+from agent import speculation, skill_aliases, skill_similarity, stream
+from agent.compact import compact_html
+from agent.project_ranking import rank_projects, is_decisive, SELECTED_PROJECTS
 from langgraph.types import interrupt, Send
 from typing import Literal
+from config import settings
 from agent.prompts import (
     JD_PARSING_SYSTEM_PROMPT,
     SKILL_MATCH_SYSTEM_PROMPT,
@@ -23,31 +28,43 @@ from agent.prompts import (
     skill_selection_user_prompt,
 )
 from agent.subagents.project_rewrite.graph import graph as project_rewrite_graph
+from agent.subagents.project_rewrite.nodes import draft_project_rewrite
 from agent.subagents.experience_rewrite.graph import graph as experience_rewrite_graph
+from agent.subagents.experience_rewrite.nodes import (
+    draft_messages,
+    draft_experience_rewrite,
+)
+from agent.subagents.experience_rewrite.prompts import (
+    BATCH_EXPERIENCE_REWRITE_SYSTEM_PROMPT,
+    batch_experience_rewrite_user_prompt,
+)
 import json
 
-model = init_chat_model("gpt-5-nano")
+jd_parsing_model = StructuredModel(JDResponseSchema)
+semantic_skill_match_model = StructuredModel(SemanticMatchResponseSchema)
+project_selection_model = StructuredModel(ProjectSelectResponseSchema)
+skill_selection_model = StructuredModel(SkillSelectionResponse)
+batch_experience_rewrite_model = StructuredModel(BatchExperienceRewriteResponse)
 
-jd_parsing_model = model.with_structured_output(JDResponseSchema)
-semantic_skill_match_model = model.with_structured_output(SemanticMatchResponseSchema)
-project_selection_model = model.with_structured_output(ProjectSelectResponseSchema)
-skill_selection_model = model.with_structured_output(SkillSelectionResponse)
 
+async def jd_parsing_node(state: TailorState) -> TailorState:
+    # seeded from the shared JD cache by create_application
+    if state.jd_json is not None:
+        return {"jd_json": state.jd_json}
 
-def jd_parsing_node(state: TailorState) -> TailorState:
     messages = [
         {
             "role": "system",
             "content": JD_PARSING_SYSTEM_PROMPT,
         },
-        {"role": "user", "content": f"JD:\n{state.raw_html}"},
+        {"role": "user", "content": f"JD:\n{compact_html(state.raw_html)}"},
     ]
 
-    response = jd_parsing_model.invoke(messages)
+    response = await call_model(jd_parsing_model, messages, node="jd_parsing_node")
     return {"jd_json": response}
 
 
-def skill_match_node(state: TailorState) -> TailorState:
+async def skill_match_node(state: TailorState) -> TailorState:
     def normalize(skills):
         return {s.strip().lower() for s in skills if s.strip()}
 
@@ -67,7 +84,23 @@ def skill_match_node(state: TailorState) -> TailorState:
     matched_nice_to_have = nice_to_have & resume
     missing_nice_to_have = nice_to_have - resume
 
-    if missing_must_have or missing_nice_to_have:
+    # known aliases first; only skills the table has never seen are scored below
+    covered, unknown = await skill_aliases.resolve(
+        missing_must_have | missing_nice_to_have, resume
+    )
+    matched_must_have |= missing_must_have & covered
+    matched_nice_to_have |= missing_nice_to_have & covered
+    missing_must_have -= covered
+    missing_nice_to_have -= covered
+
+    # confident look-alikes and clear misses are decided locally
+    similar, _, ambiguous = skill_similarity.classify(unknown, resume)
+    matched_must_have |= missing_must_have & similar
+    matched_nice_to_have |= missing_nice_to_have & similar
+    missing_must_have -= similar
+    missing_nice_to_have -= similar
+
+    if ambiguous:
         messages = [
             {
                 "role": "system",
@@ -76,12 +109,17 @@ def skill_match_node(state: TailorState) -> TailorState:
             {
                 "role": "user",
                 "content": skill_match_user_prompt(
-                    resume, missing_must_have, missing_nice_to_have
+                    resume,
+                    missing_must_have & ambiguous,
+                    missing_nice_to_have & ambiguous,
                 ),
             },
         ]
 
-        semantic_matches = semantic_skill_match_model.invoke(messages)
+        semantic_matches = await call_model(
+            semantic_skill_match_model, messages, node="skill_match_node"
+        )
+        await skill_aliases.learn(ambiguous, resume, semantic_matches)
         matched_must_have |= set(semantic_matches.matched_must_have)
         missing_must_have -= set(semantic_matches.matched_must_have)
         matched_nice_to_have |= set(semantic_matches.matched_nice_to_have)
@@ -103,20 +141,45 @@ def skill_match_node(state: TailorState) -> TailorState:
     }
 
 
-def project_selection_node(state: TailorState):
+async def project_selection_node(state: TailorState):
+    projects = state.resume_json.projects
+    ranking = state.project_ranking or rank_projects(state.jd_json, projects)
+    # the LLM only sees the top-ranked candidates, indexed in ranking order
+    candidates = [
+        projects[r["index"]] for r in ranking[: settings.PROJECT_RANK_TOP_K]
+    ]
+
     messages = state.project_messages or [
         {"role": "system", "content": PROJECT_SELECTION_SYSTEM_PROMPT},
-        {"role": "user", "content": project_selection_user_prompt(state)},
+        {
+            "role": "user",
+            "content": project_selection_user_prompt(state.jd_json, candidates),
+        },
     ]
 
-    response = project_selection_model.invoke(messages)
+    if not state.project_messages and is_decisive(
+        ranking, settings.PROJECT_RANK_MARGIN
+    ):
+        response = ProjectSelectResponseSchema(
+            selected_project_indexes=list(range(min(SELECTED_PROJECTS, len(candidates))))
+        )
+    else:
+        response = await call_model(
+            project_selection_model,
+            messages,
+            node="project_selection_node",
+            iteration=state.project_selection_iteration + 1,
+        )
 
     selected_projects = [
-        state.resume_json.projects[i]
+        candidates[i]
         for i in response.selected_project_indexes
-        if 0 <= i < len(state.resume_json.projects)
+        if 0 <= i < len(candidates)
     ]
 
+    if settings.SPECULATIVE_PROJECT_REWRITE:
+        speculate_project_rewrites(state.jd_json, selected_projects)
+
     assistant_payload = {
         "selected_projects": [p.model_dump() for p in selected_projects]
     }
@@ -131,15 +194,36 @@ def project_selection_node(state: TailorState):
         ]
 
     return {
+        "project_ranking": ranking,
+        "project_selection_iteration": state.project_selection_iteration + 1,
         "selected_projects": selected_projects,
         "project_messages": messages_to_store,
     }
 
 
-def project_selection_review_node(state: TailorState):
+def speculate_project_rewrites(jd_json: JDResponseSchema, projects: list[Project]):
+    # Draft the rewrites while the selection (and then the skills) are under
+    # review. Drafts for projects dropped by a reselection are cancelled; ones
+    # still selected are kept and adopted by project_rewrite_node.
+    thread_id = current_thread_id()
+    jd = jd_json.model_dump()
+    keys = {}
+    for p in projects:
+        project = p.model_dump()
+        keys[speculation.project_key(jd, project)] = project
+
+    speculation.discard(thread_id, keep=set(keys))
+    for key, project in keys.items():
+        speculation.speculate(
+            thread_id, key, lambda project=project: draft_project_rewrite(jd, project)
+        )
+
+
+async def project_selection_review_node(state: TailorState):
     human_response = interrupt(
         {
             "selected_projects": [p.model_dump() for p in state.selected_projects],
+            "project_ranking": state.project_ranking,
             "message": "Review the selected projects. Approve or provide feedback.",
         }
     )
@@ -159,7 +243,7 @@ def project_selection_review_node(state: TailorState):
         }
 
 
-def should_reselect_projects(
+async def should_reselect_projects(
     state: TailorState,
 ) -> Literal["project_selection_node", "skill_selection_node"]:
     if state.project_messages and state.project_messages[-1]["role"] == "user":
@@ -167,13 +251,18 @@ def should_reselect_projects(
     return "skill_selection_node"
 
 
-def skill_selection_node(state: TailorState):
+async def skill_selection_node(state: TailorState):
     messages = state.skill_messages or [
         {"role": "system", "content": SKILL_SELECTION_SYSTEM_PROMPT},
         {"role": "user", "content": skill_selection_user_prompt(state)},
     ]
 
-    response = skill_selection_model.invoke(messages)
+    response = await call_model(
+        skill_selection_model,
+        messages,
+        node="skill_selection_node",
+        iteration=state.skill_selection_iteration + 1,
+    )
 
     if not state.skill_messages:
         messages_to_store = messages + [
@@ -186,11 +275,12 @@ def skill_selection_node(state: TailorState):
 
     return {
         "selected_skills": response.selected_skills,
+        "skill_selection_iteration": state.skill_selection_iteration + 1,
         "skill_messages": messages_to_store,
     }
 
 
-def skill_selection_review_node(state: TailorState):
+async def skill_selection_review_node(state: TailorState):
     human_response = interrupt(
         {
             "selected_skills": [s.model_dump() for s in state.selected_skills],
@@ -203,14 +293,14 @@ def skill_selection_review_node(state: TailorState):
     return {"selected_skills": [SkillCategory(**s) for s in response.edited_skills]}
 
 
-def continue_to_project_rewrite_node(state: TailorState):
+async def continue_to_project_rewrite_node(state: TailorState):
     return [
         Send("execute_project_rewrite_node", {"jd_json": state.jd_json, "project": p})
         for p in state.selected_projects
     ]
 
 
-def execute_project_rewrite_node(state: TailorState):
+async def execute_project_rewrite_node(state: TailorState):
     project_in = state["project"]
     title = (
         project_in.title
@@ -222,7 +312,7 @@ def execute_project_rewrite_node(state: TailorState):
     print(f"  execute_project_rewrite_node : '{title}'")
     print(f"{'=' * 50}")
 
-    result = project_rewrite_graph.invoke(
+    result = await project_rewrite_graph.ainvoke(
         {
             "jd_json": state["jd_json"].model_dump(),
             "project": project_in.model_dump()
@@ -249,21 +339,76 @@ def execute_project_rewrite_node(state: TailorState):
     return {"rewritten_projects": [project_out]}
 
 
-def project_join_node(state: TailorState):
+async def project_join_node(state: TailorState):
     return {}
 
 
-def continue_to_experience_rewrite_node(state: TailorState):
+async def batch_experience_rewrite_node(state: TailorState):
+    experiences = [e.model_dump() for e in state.resume_json.experience]
+    messages = [
+        {"role": "system", "content": BATCH_EXPERIENCE_REWRITE_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": batch_experience_rewrite_user_prompt(
+                state.jd_json.model_dump(), experiences
+            ),
+        },
+    ]
+
+    response = await call_model(
+        batch_experience_rewrite_model, messages, node="batch_experience_rewrite_node"
+    )
+    drafts = {
+        str(i): r.rewritten_experience
+        for i, r in enumerate(response.rewritten_experiences[: len(experiences)])
+    }
+
+    print(f"\n  batch_experience_rewrite_node : {len(drafts)}/{len(experiences)} drafts")
+
+    return {"experience_drafts": drafts}
+
+
+async def continue_to_experience_draft_node(state: TailorState):
+    return [
+        Send(
+            "experience_draft_node",
+            {"jd_json": state.jd_json, "experience": e, "index": i},
+        )
+        for i, e in enumerate(state.resume_json.experience)
+    ]
+
+
+async def experience_draft_node(state: TailorState):
+    experience = state["experience"]
+    # streamed under the same item as the entry's later rewrites
+    partial, done = stream.publisher(
+        "experience_rewrite_node",
+        f"{experience.role} @ {experience.company}",
+        "rewritten_experience",
+    )
+    response = await draft_experience_rewrite(
+        state["jd_json"].model_dump(), experience.model_dump(), on_partial=partial
+    )
+    await done(response.rewritten_experience.model_dump(mode="json"))
+    return {"experience_drafts": {str(state["index"]): response.rewritten_experience}}
+
+
+async def continue_to_experience_rewrite_node(state: TailorState):
+    # entries without a draft fall back to their own rewrite call in the subgraph
     return [
         Send(
             "execute_experience_rewrite_node",
-            {"jd_json": state.jd_json, "experience": e},
+            {
+                "jd_json": state.jd_json,
+                "experience": e,
+                "draft": state.experience_drafts.get(str(i)),
+            },
         )
-        for e in state.resume_json.experience
+        for i, e in enumerate(state.resume_json.experience)
     ]
 
 
-def execute_experience_rewrite_node(state: TailorState):
+async def execute_experience_rewrite_node(state: TailorState):
     experience_in = state["experience"]
     company = (
         experience_in.company
@@ -280,14 +425,21 @@ def execute_experience_rewrite_node(state: TailorState):
     print(f"  execute_experience_rewrite_node : '{role} @ {company}'")
     print(f"{'=' * 50}")
 
-    result = experience_rewrite_graph.invoke(
-        {
-            "jd_json": state["jd_json"].model_dump(),
-            "experience": experience_in.model_dump()
-            if hasattr(experience_in, "model_dump")
-            else experience_in,
-        }
-    )
+    subgraph_input = {
+        "jd_json": state["jd_json"].model_dump(),
+        "experience": experience_in.model_dump()
+        if hasattr(experience_in, "model_dump")
+        else experience_in,
+    }
+    draft = state.get("draft")
+    if draft:
+        subgraph_input["rewritten_experience"] = draft
+        subgraph_input["iteration"] = 1
+        subgraph_input["experience_rewrite_messages"] = draft_messages(
+            subgraph_input["jd_json"], subgraph_input["experience"], draft
+        )
+
+    result = await experience_rewrite_graph.ainvoke(subgraph_input)
 
     raw = result["rewritten_experience"]
     experience_out = Experience(**raw) if isinstance(raw, dict) else raw
@@ -298,7 +450,7 @@ def execute_experience_rewrite_node(state: TailorState):
     return {"rewritten_experience": [experience_out]}
 
 
-def assemble_resume_node(state: TailorState):
+async def assemble_resume_node(state: TailorState):
     tailored = state.resume_json.model_copy(deep=True)
     tailored.projects = state.rewritten_projects
     tailored.skills = state.selected_skills
@@ -0,0 +1,82 @@
+import re
+import numpy as np
+from schemas import JDResponseSchema, Project
+
+# how many projects make it onto the tailored resume
+SELECTED_PROJECTS = 3
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9][a-z0-9+#.]*", text.lower())
+
+
+def project_terms(project: Project) -> list[str]:
+    # technologies are the strongest signal, so they count twice
+    technologies = tokenize(" ".join(project.technologies))
+    return (
+        tokenize(project.title)
+        + tokenize(project.description or "")
+        + tokenize(" ".join(project.bullets))
+        + technologies * 2
+    )
+
+
+def jd_terms(jd_json: JDResponseSchema) -> list[str]:
+    return (
+        tokenize(" ".join(jd_json.keywords)) * 2
+        + tokenize(" ".join(jd_json.must_have_qualifications)) * 2
+        + tokenize(" ".join(jd_json.nice_to_have_qualifications))
+        + tokenize(" ".join(jd_json.responsibilities))
+    )
+
+
+def rank_projects(jd_json: JDResponseSchema, projects: list[Project]) -> list[dict]:
+    """TF-IDF cosine of each project against the JD, best first.
+
+    Returns ``{"index", "title", "score"}`` per project, where ``index`` is the
+    position in ``resume_json.projects``.
+    """
+    if not projects:
+        return []
+
+    documents = [project_terms(p) for p in projects]
+    query = jd_terms(jd_json)
+    vocabulary = {term: i for i, term in enumerate(sorted(set(query)))}
+
+    counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    for row, terms in enumerate(documents):
+        for term in terms:
+            column = vocabulary.get(term)
+            if column is not None:
+                counts[row, column] += 1
+    query_counts = np.zeros(len(vocabulary), dtype=np.float32)
+    for term in query:
+        query_counts[vocabulary[term]] += 1
+
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+
+    matrix = np.log1p(counts) * idf
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+    query_vector = np.log1p(query_counts) * idf
+    query_vector /= max(np.linalg.norm(query_vector), 1e-9)
+
+    scores = matrix @ query_vector
+    order = np.argsort(-scores, kind="stable")
+    return [
+        {
+            "index": int(i),
+            "title": projects[i].title,
+            "score": round(float(scores[i]), 4),
+        }
+        for i in order
+    ]
+
+
+def is_decisive(ranking: list[dict], margin: float) -> bool:
+    """True when the top picks can be taken without asking the LLM."""
+    if len(ranking) <= SELECTED_PROJECTS:
+        return True
+    last_pick = ranking[SELECTED_PROJECTS - 1]["score"]
+    first_left_out = ranking[SELECTED_PROJECTS]["score"]
+    return last_pick - first_left_out >= margin
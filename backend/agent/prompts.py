@@ -1,3 +1,13 @@
+from agent.compact import (
+    REQUIRED,
+    compact_list,
+    compact_skills,
+    compact_experience,
+    jd_parts,
+    project_parts,
+    fit,
+)
+
 JD_PARSING_SYSTEM_PROMPT = (
     "You are a precise job description parser. Extract structured data from job descriptions into JSON. "
     "Follow these rules strictly:\n\n"
@@ -30,15 +40,16 @@ SKILL_MATCH_SYSTEM_PROMPT = (
     "NEVER match on:\n"
     "- Completely unrelated technologies (e.g. 'Java' does not match 'JavaScript')\n"
     "- Soft skills or general terms with no technical overlap\n\n"
-    "Return only the JD skills that are genuinely covered. Be liberal with semantic matches but strict about technical accuracy."
+    "Return only the JD skills that are genuinely covered. Be liberal with semantic matches but strict about technical accuracy. "
+    "For every JD skill you match, also return the resume skill that covers it in matched_pairs, using the names exactly as given."
 )
 
 
 def skill_match_user_prompt(resume, missing_must_have, missing_nice_to_have):
     return (
-        f"Resume skills: {list(resume)}\n\n"
-        f"Unmatched must-have JD skills: {list(missing_must_have)}\n"
-        f"Unmatched nice-to-have JD skills: {list(missing_nice_to_have)}\n\n"
+        f"Resume skills: {compact_list(resume)}\n\n"
+        f"Unmatched must-have JD skills: {compact_list(missing_must_have)}\n"
+        f"Unmatched nice-to-have JD skills: {compact_list(missing_nice_to_have)}\n\n"
         f"Which unmatched JD skills are semantically covered by the resume skills?"
     )
 
@@ -63,11 +74,13 @@ PROJECT_SELECTION_SYSTEM_PROMPT = (
 )
 
 
-def project_selection_user_prompt(state):
-    return (
-        f"Job Description:\n{state.jd_json}\n\n"
-        f"Projects (indexed starting at 0):\n{state.resume_json.projects}"
-    )
+def project_selection_user_prompt(jd_json, projects):
+    # bullets of the lowest-ranked candidates are trimmed first
+    parts = [(REQUIRED, "Job Description:"), *jd_parts(jd_json, detail=3)]
+    parts.append((REQUIRED, "\nProjects (indexed starting at 0):"))
+    for i, p in enumerate(projects):
+        parts += project_parts(p, i)
+    return fit(parts, "project_selection_node")
 
 
 SKILL_SELECTION_SYSTEM_PROMPT = (
@@ -84,11 +97,14 @@ SKILL_SELECTION_SYSTEM_PROMPT = (
 
 
 def skill_selection_user_prompt(state):
-    return (
-        f"JD Keywords: {state.jd_json.keywords}\n"
-        f"Must-have skills: {state.skill_match_results.matched_must_have}\n"
-        f"Missing skills: {state.skill_match_results.missing_must_have}\n\n"
-        f"Candidate skills: {state.resume_json.skills}"
+    return fit(
+        [
+            (2, f"JD Keywords: {compact_list(state.jd_json.keywords)}"),
+            (2, f"Must-have skills: {compact_list(state.skill_match_results.matched_must_have)}"),
+            (1, f"Missing skills: {compact_list(state.skill_match_results.missing_must_have)}"),
+            (REQUIRED, f"\nCandidate skills:\n{compact_skills(state.resume_json.skills)}"),
+        ],
+        "skill_selection_node",
     )
 
 
@@ -119,8 +135,9 @@ EXPERIENCE_REWRITE_SYSTEM_PROMPT = (
 
 
 def experience_rewrite_user_prompt(state):
+    entries = "\n\n".join(compact_experience(e) for e in state.resume_json.experience)
     return (
-        f"Job Description Keywords: {state.jd_json.keywords}\n"
-        f"Matched Must-Have Skills: {state.skill_match_results.matched_must_have}\n\n"
-        f"Experience entries to rewrite:\n{state.resume_json.experience}"
+        f"Job Description Keywords: {compact_list(state.jd_json.keywords)}\n"
+        f"Matched Must-Have Skills: {compact_list(state.skill_match_results.matched_must_have)}\n\n"
+        f"Experience entries to rewrite:\n{entries}"
     )
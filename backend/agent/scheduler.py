@@ -0,0 +1,128 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from statistics import mean
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units evenly over each minute, bursting up to a minute's worth."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """Process-wide gate in front of the model provider.
+
+    Callers queue per key (one key per application) and are released round-robin
+    across keys, so one application's fan-out cannot starve the others. A call is
+    released only when an in-flight slot is free and both the requests-per-minute
+    and tokens-per-minute buckets can cover it.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        stats_window: int = 1000,
+    ):
+        self.max_in_flight = max_in_flight
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.in_flight = 0
+        self.completed = 0
+        self._queues: OrderedDict[str, deque] = OrderedDict()
+        self._waits: deque[float] = deque(maxlen=stats_window)
+        self._timer: asyncio.TimerHandle | None = None
+
+    @asynccontextmanager
+    async def slot(self, key: str, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append((future, tokens, time.monotonic()))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        self.in_flight -= 1
+        self.completed += 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._queues and self.in_flight < self.max_in_flight:
+            key, queue = next(iter(self._queues.items()))
+            future, tokens, queued_at = queue[0]
+
+            if future.cancelled():
+                self._pop(key, queue)
+                continue
+
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait > 0:
+                self._schedule(wait)
+                return
+
+            self._pop(key, queue)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self.in_flight += 1
+            self._waits.append(time.monotonic() - queued_at)
+            future.set_result(None)
+
+    def _pop(self, key: str, queue: deque):
+        queue.popleft()
+        del self._queues[key]
+        if queue:
+            # back of the line, so the next application gets the next slot
+            self._queues[key] = queue
+
+    def _schedule(self, wait: float):
+        if self._timer and not self._timer.cancelled():
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": sum(len(q) for q in self._queues.values()),
+            "queued_applications": len(self._queues),
+            "completed": self.completed,
+            "wait_seconds": {
+                "mean": round(mean(waits), 3) if waits else 0.0,
+                "p50": round(waits[len(waits) // 2], 3) if waits else 0.0,
+                "p95": round(waits[int(len(waits) * 0.95)], 3) if waits else 0.0,
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
@@ -0,0 +1,154 @@
+import asyncio
+from sqlalchemy import select, update, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from db import SessionLocal
+from models import SkillAlias
+from config import settings
+
+# Groups of names for the same skill; any two members of a group match.
+SEED_ALIASES = [
+    {"kubernetes", "k8s"},
+    {"javascript", "js", "ecmascript"},
+    {"typescript", "ts"},
+    {"postgresql", "postgres", "psql"},
+    {"mongodb", "mongo"},
+    {"amazon web services", "aws"},
+    {"google cloud platform", "google cloud", "gcp"},
+    {"microsoft azure", "azure"},
+    {"node.js", "nodejs", "node"},
+    {"react", "react.js", "reactjs"},
+    {"vue", "vue.js", "vuejs"},
+    {"next.js", "nextjs"},
+    {"golang", "go"},
+    {"c#", "csharp", "c sharp"},
+    {"c++", "cpp"},
+    {"machine learning", "ml"},
+    {"artificial intelligence", "ai"},
+    {"natural language processing", "nlp"},
+    {"large language models", "llms", "llm"},
+    {"continuous integration", "ci"},
+    {"ci/cd", "cicd", "ci cd"},
+    {"scikit-learn", "sklearn", "scikit learn"},
+    {"restful apis", "rest apis", "rest", "rest api", "restful api"},
+    {"graphql", "gql"},
+    {"elasticsearch", "elastic search"},
+    {"github actions", "gh actions"},
+]
+
+_seed_pairs = {
+    (a, b) for group in SEED_ALIASES for a in group for b in group if a != b
+}
+
+counters = {"lookups": 0, "seed_hits": 0, "table_hits": 0, "misses": 0, "learned": 0}
+
+
+def _known_pairs(jd_skills: set[str], resume_skills: set[str]) -> dict:
+    pairs = [(j, r) for j in jd_skills for r in resume_skills]
+    if not pairs:
+        return {}
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(SkillAlias.jd_skill, SkillAlias.resume_skill, SkillAlias.matches).where(
+                tuple_(SkillAlias.jd_skill, SkillAlias.resume_skill).in_(pairs)
+            )
+        ).all()
+        positive = [(j, r) for j, r, matches in rows if matches]
+        if positive:
+            db.execute(
+                update(SkillAlias)
+                .where(tuple_(SkillAlias.jd_skill, SkillAlias.resume_skill).in_(positive))
+                .values(hits=SkillAlias.hits + 1)
+            )
+            db.commit()
+    return {(j, r): matches for j, r, matches in rows}
+
+
+async def resolve(jd_skills: set[str], resume_skills: set[str]) -> tuple[set, set]:
+    """Splits JD skills missing from the resume into (covered, still unknown).
+
+    A skill is covered when the seed dictionary or a learned pair says some
+    resume skill matches it. It is left out of both sets when every resume
+    skill is already known not to match, so the LLM never sees it again.
+    """
+    if not settings.SKILL_ALIASES_ENABLED:
+        return set(), set(jd_skills)
+
+    covered = {j for j in jd_skills if any((j, r) in _seed_pairs for r in resume_skills)}
+    remaining = jd_skills - covered
+
+    known = {}
+    if remaining:
+        try:
+            known = await asyncio.to_thread(_known_pairs, remaining, resume_skills)
+        except Exception as e:
+            print(f"Skill alias lookup failed: {e}")
+
+    unknown = set()
+    table_hits = 0
+    for j in remaining:
+        verdicts = [known.get((j, r)) for r in resume_skills]
+        if any(verdicts):
+            covered.add(j)
+            table_hits += 1
+        elif None in verdicts:
+            unknown.add(j)
+        else:
+            table_hits += 1
+
+    counters["lookups"] += len(jd_skills)
+    counters["seed_hits"] += len(jd_skills) - len(remaining)
+    counters["table_hits"] += table_hits
+    counters["misses"] += len(unknown)
+    return covered, unknown
+
+
+def _store(rows: list[dict]):
+    with SessionLocal() as db:
+        db.execute(insert(SkillAlias).values(rows).on_conflict_do_nothing())
+        db.commit()
+
+
+async def learn(asked: set[str], resume_skills: set[str], response):
+    """Records the semantic match verdicts for the JD skills in ``asked``.
+
+    Skills the LLM matched are stored against the resume skill it named;
+    skills it left unmatched are stored as not covered by any resume skill.
+    """
+    if not settings.SKILL_ALIASES_ENABLED or not asked:
+        return
+
+    rows = {}
+    for pair in response.matched_pairs:
+        j = pair.jd_skill.strip().lower()
+        r = pair.resume_skill.strip().lower()
+        if j in asked and r in resume_skills:
+            rows[(j, r)] = True
+    matched = {
+        s.strip().lower()
+        for s in response.matched_must_have + response.matched_nice_to_have
+    }
+    for j in asked - matched:
+        for r in resume_skills:
+            rows[(j, r)] = False
+
+    if not rows:
+        return
+    try:
+        await asyncio.to_thread(
+            _store,
+            [
+                {"jd_skill": j, "resume_skill": r, "matches": matches, "hits": 0}
+                for (j, r), matches in rows.items()
+            ],
+        )
+        counters["learned"] += len(rows)
+    except Exception as e:
+        print(f"Skill alias write failed: {e}")
+
+
+def stats() -> dict:
+    resolved = counters["seed_hits"] + counters["table_hits"]
+    return {
+        **counters,
+        "hit_rate": round(resolved / counters["lookups"], 3) if counters["lookups"] else 0.0,
+    }
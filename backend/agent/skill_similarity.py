@@ -0,0 +1,71 @@
+import re
+import zlib
+import numpy as np
+from config import settings
+
+DIMENSIONS = 4096
+
+
+def _features(skill: str) -> list[str]:
+    # character trigrams catch versions and spellings ("python 3", "react.js"),
+    # whole tokens reward shared words in multi-word skills
+    padded = f" {skill} "
+    grams = [padded[i : i + 3] for i in range(len(padded) - 2)]
+    return grams + [f"#{token}" for token in skill.split()]
+
+
+def _words(skill: str) -> str:
+    # the letters of a skill without versions, spacing and punctuation:
+    # "python 3", "node.js" and "ci/cd" read as "python", "nodejs" and "cicd"
+    return "".join(re.findall(r"[a-z+#]+", skill))
+
+
+def vectorize(skills: list[str]) -> np.ndarray:
+    """L2-normalized hashed n-gram counts, one row per skill."""
+    rows, cols = [], []
+    for row, skill in enumerate(skills):
+        for feature in _features(skill):
+            rows.append(row)
+            cols.append(zlib.crc32(feature.encode()) % DIMENSIONS)
+
+    matrix = np.zeros((len(skills), DIMENSIONS), dtype=np.float32)
+    np.add.at(matrix, (rows, cols), 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+def similarity_matrix(jd_skills: list[str], resume_skills: list[str]) -> np.ndarray:
+    """Cosine similarity of every JD skill (rows) to every resume skill (columns)."""
+    return vectorize(jd_skills) @ vectorize(resume_skills).T
+
+
+def classify(jd_skills: set[str], resume_skills: set[str]) -> tuple[set, set, set]:
+    """Splits JD skills into (matched, rejected, ambiguous).
+
+    A skill matches locally only when it has the same words as a resume skill;
+    a high score alone isn't enough ("react native" vs "react"). Skills whose
+    best resume score is under SKILL_SIMILARITY_REJECT are rejected, and the
+    rest are left to the LLM. In offline mode those are decided by score
+    instead: at or above SKILL_SIMILARITY_ACCEPT they match.
+    """
+    if not jd_skills:
+        return set(), set(), set()
+    if not resume_skills:
+        return set(), set(jd_skills), set()
+
+    jd = sorted(jd_skills)
+    best = similarity_matrix(jd, sorted(resume_skills)).max(axis=1)
+
+    resume_words = {_words(skill) for skill in resume_skills} - {""}
+    matched = {skill for skill in jd if _words(skill) in resume_words}
+    rejected = {
+        skill
+        for skill, score in zip(jd, best)
+        if score < settings.SKILL_SIMILARITY_REJECT and skill not in matched
+    }
+    ambiguous = set(jd) - matched - rejected
+    if settings.SKILL_SIMILARITY_OFFLINE:
+        scores = dict(zip(jd, best))
+        close = {s for s in ambiguous if scores[s] >= settings.SKILL_SIMILARITY_ACCEPT}
+        return matched | close, rejected | (ambiguous - close), set()
+    return matched, rejected, ambiguous
@@ -0,0 +1,53 @@
+import asyncio
+import hashlib
+import json
+import time
+from config import settings
+
+# (thread_id, key) -> (started_at, task); drafts only live in this process, so a
+# run resumed on another worker simply makes the call itself
+_drafts: dict[tuple[str, str], tuple[float, asyncio.Task]] = {}
+
+
+def project_key(jd_json: dict, project: dict) -> str:
+    payload = json.dumps([jd_json, project], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _sweep():
+    cutoff = time.monotonic() - settings.SPECULATION_TTL_SECONDS
+    for entry, (started_at, task) in list(_drafts.items()):
+        if started_at < cutoff:
+            task.cancel()
+            del _drafts[entry]
+
+
+def speculate(thread_id: str, key: str, coro_factory):
+    """Start ``coro_factory()`` in the background unless a draft for ``key`` already exists."""
+    _sweep()
+    if (thread_id, key) in _drafts:
+        return
+    task = asyncio.create_task(coro_factory())
+    # never-adopted drafts must not log "exception was never retrieved"
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _drafts[(thread_id, key)] = (time.monotonic(), task)
+
+
+async def adopt(thread_id: str, key: str):
+    """Result of the speculative draft for ``key``, or None if there is no usable one."""
+    entry = _drafts.pop((thread_id, key), None)
+    if entry is None or entry[1].cancelled():
+        return None
+    try:
+        return await entry[1]
+    except Exception as e:
+        print(f"Speculative draft failed, rewriting normally: {e}")
+        return None
+
+
+def discard(thread_id: str, keep: set[str] = frozenset()):
+    """Cancel this thread's drafts except the ones in ``keep``."""
+    for entry, (_, task) in list(_drafts.items()):
+        if entry[0] == thread_id and entry[1] not in keep:
+            task.cancel()
+            del _drafts[entry]
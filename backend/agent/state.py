@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List, Annotated
 import operator
+from agent.history import bounded_history
 from schemas import (
     JDResponseSchema,
     ResumeSchema,
@@ -11,15 +12,25 @@ from schemas import (
 )
 
 
+def merge_dicts(left: dict, right: dict) -> dict:
+    return {**(left or {}), **(right or {})}
+
+
 class TailorState(BaseModel):
     raw_html: str = ""
     jd_json: Optional[JDResponseSchema] = None
     resume_json: Optional[ResumeSchema] = None
     skill_match_results: Optional[SkillMatchResultSchema] = None
-    project_messages: Annotated[list, operator.add] = []
+    # local relevance ranking of resume_json.projects, best first
+    project_ranking: Optional[List[dict]] = None
+    project_messages: Annotated[list, bounded_history] = []
+    project_selection_iteration: int = 0
     selected_projects: Optional[List[Project]] = None
-    skill_messages: Annotated[list, operator.add] = []
+    skill_messages: Annotated[list, bounded_history] = []
+    skill_selection_iteration: int = 0
     selected_skills: Optional[List[SkillCategory]] = None
     rewritten_projects: Annotated[List[Project], operator.add] = []
+    # first drafts keyed by the entry's index in resume_json.experience
+    experience_drafts: Annotated[dict[str, Experience], merge_dicts] = {}
     rewritten_experience: Annotated[List[Experience], operator.add] = []
     tailored_resume_json: Optional[ResumeSchema] = None
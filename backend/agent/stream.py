@@ -0,0 +1,50 @@
+"""Rewrites in progress, pushed to /api/applications/{id}/stream.
+
+Events go out through utils.progress on a channel of their own, so with
+PROGRESS_BACKEND=postgres a rewrite made by worker.py reaches clients of every
+API process. Each event carries the whole object so far: a client that
+connects mid-rewrite is current again at the next one, and skipping a partial
+loses nothing. Partials of one item are therefore sent at most every
+STREAM_PARTIAL_SECONDS; the finished value always is.
+"""
+
+import time
+from agent.llm import current_thread_id
+from utils import progress
+from config import settings
+
+
+def rewrite_channel(thread_id) -> str:
+    # runs started by the API use the application id as their thread id
+    return f"rewrite:{thread_id}"
+
+
+def publisher(node: str, item: str, field: str):
+    """Callbacks that stream one rewrite to the run's channel.
+
+    ``partial`` receives the growing structured response and forwards its
+    ``field``; ``done`` sends the final object, exactly as the review interrupt
+    will carry it.
+    """
+    channel = rewrite_channel(current_thread_id())
+    last_sent = float("-inf")
+
+    async def partial(response: dict):
+        nonlocal last_sent
+        value = response.get(field)
+        if not isinstance(value, dict):
+            return
+        now = time.monotonic()
+        if now - last_sent < settings.STREAM_PARTIAL_SECONDS:
+            return
+        last_sent = now
+        await progress.publish(
+            channel, {"node": node, "item": item, "done": False, "value": value}
+        )
+
+    async def done(value: dict):
+        await progress.publish(
+            channel, {"node": node, "item": item, "done": True, "value": value}
+        )
+
+    return partial, done
@@ -2,16 +2,21 @@ from agent.subagents.experience_rewrite.nodes import (
     experience_rewrite_node,
     experience_rewrite_review_node,
     should_rewrite_experience,
+    route_experience_entry,
 )
 from agent.subagents.experience_rewrite.state import ExperienceSubgraphState
-from langgraph.graph import END, StateGraph
+from langgraph.graph import START, END, StateGraph
 
 builder = StateGraph(ExperienceSubgraphState)
 
 builder.add_node("experience_rewrite_node", experience_rewrite_node)
 builder.add_node("experience_rewrite_review_node", experience_rewrite_review_node)
 
-builder.set_entry_point("experience_rewrite_node")
+builder.add_conditional_edges(
+    START,
+    route_experience_entry,
+    ["experience_rewrite_node", "experience_rewrite_review_node"],
+)
 builder.add_edge("experience_rewrite_node", "experience_rewrite_review_node")
 builder.add_conditional_edges(
     "experience_rewrite_review_node",
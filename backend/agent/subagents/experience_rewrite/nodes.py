@@ -3,33 +3,78 @@ from agent.subagents.experience_rewrite.prompts import (
     experience_rewrite_user_prompt,
 )
 from agent.subagents.experience_rewrite.state import ExperienceSubgraphState
-from langchain.chat_models import init_chat_model
-from schemas import ExperienceRewriteResponse, HumanReviewResponse
+from schemas import ExperienceRewriteResponse, HumanReviewResponse, Experience
 from langgraph.types import interrupt
 from typing import Literal
 from langgraph.graph import END
+from agent.llm import StructuredModel, call_model
+from agent import stream
 
-model = init_chat_model("gpt-5-nano")
-experience_rewrite_model = model.with_structured_output(ExperienceRewriteResponse)
+experience_rewrite_model = StructuredModel(ExperienceRewriteResponse)
 
 
-def experience_rewrite_node(state: ExperienceSubgraphState):
+def initial_messages(jd_json: dict, experience: dict) -> list:
+    state = ExperienceSubgraphState(jd_json=jd_json, experience=experience)
+    return [
+        {"role": "system", "content": EXPERIENCE_REWRITE_SYSTEM_PROMPT},
+        {"role": "user", "content": experience_rewrite_user_prompt(state)},
+    ]
+
+
+async def draft_experience_rewrite(
+    jd_json: dict, experience: dict, on_partial=None
+) -> ExperienceRewriteResponse:
+    """First rewrite of an entry, identical to experience_rewrite_node's first iteration."""
+    return await call_model(
+        experience_rewrite_model,
+        initial_messages(jd_json, experience),
+        node="experience_rewrite_node",
+        on_partial=on_partial,
+    )
+
+
+def draft_messages(jd_json: dict, experience: dict, draft: Experience) -> list:
+    """History for an entry whose first draft was made ahead of the subgraph.
+
+    Feedback on the draft then continues this entry's own conversation, exactly
+    as if the draft had been produced by experience_rewrite_node.
+    """
+    return initial_messages(jd_json, experience) + [
+        {
+            "role": "assistant",
+            "content": ExperienceRewriteResponse(
+                rewritten_experience=draft
+            ).model_dump_json(),
+        },
+    ]
+
+
+async def experience_rewrite_node(state: ExperienceSubgraphState):
     company = state.experience.get("company", "?") if isinstance(state.experience, dict) else "?"
     role = state.experience.get("role", "?") if isinstance(state.experience, dict) else "?"
-    iteration = len([m for m in state.experience_rewrite_messages if m.get("role") == "user"]) + 1
+    iteration = state.iteration + 1
 
     print("\n--- experience_rewrite_node ---")
     print(f"    experience : '{role} @ {company}'")
     print(f"    iteration  : {iteration}")
     print(f"    messages   : {len(state.experience_rewrite_messages)} in history")
 
-    messages = state.experience_rewrite_messages or [
-        {"role": "system", "content": EXPERIENCE_REWRITE_SYSTEM_PROMPT},
-        {"role": "user", "content": experience_rewrite_user_prompt(state)},
-    ]
+    messages = state.experience_rewrite_messages or initial_messages(
+        state.jd_json, state.experience
+    )
 
-    response = experience_rewrite_model.invoke(messages)
+    partial, done = stream.publisher(
+        "experience_rewrite_node", f"{role} @ {company}", "rewritten_experience"
+    )
+    response = await call_model(
+        experience_rewrite_model,
+        messages,
+        node="experience_rewrite_node",
+        iteration=iteration,
+        on_partial=partial,
+    )
     entry = response.rewritten_experience
+    await done(entry.model_dump(mode="json"))
 
     print(f"    produced   : {len(entry.bullets)} bullets")
     for b in entry.bullets:
@@ -47,10 +92,11 @@ def experience_rewrite_node(state: ExperienceSubgraphState):
     return {
         "rewritten_experience": entry,
         "experience_rewrite_messages": messages_to_store,
+        "iteration": iteration,
     }
 
 
-def experience_rewrite_review_node(state: ExperienceSubgraphState):
+async def experience_rewrite_review_node(state: ExperienceSubgraphState):
     entry = state.rewritten_experience
     role = entry.role if entry else "?"
     company = entry.company if entry else "?"
@@ -90,7 +136,16 @@ def experience_rewrite_review_node(state: ExperienceSubgraphState):
         }
 
 
-def should_rewrite_experience(
+async def route_experience_entry(
+    state: ExperienceSubgraphState,
+) -> Literal["experience_rewrite_node", "experience_rewrite_review_node"]:
+    if state.rewritten_experience:
+        print("\n-> draft supplied, routing to experience_rewrite_review_node")
+        return "experience_rewrite_review_node"
+    return "experience_rewrite_node"
+
+
+async def should_rewrite_experience(
     state: ExperienceSubgraphState,
 ) -> Literal["experience_rewrite_node", "__end__"]:
     last = state.experience_rewrite_messages[-1] if state.experience_rewrite_messages else None
@@ -1,3 +1,5 @@
+from agent.compact import REQUIRED, compact_experience, jd_parts, fit
+
 EXPERIENCE_REWRITE_SYSTEM_PROMPT = (
     "You are a resume tailoring assistant.\n"
     "Your task is to rewrite work experience bullets so they better align with the job description.\n\n"
@@ -25,4 +27,33 @@ EXPERIENCE_REWRITE_SYSTEM_PROMPT = (
 
 
 def experience_rewrite_user_prompt(state):
-    return f"Job Description: {state.jd_json}\nExperience entry to rewrite:\n{state.experience}"
+    return fit(
+        [
+            (REQUIRED, "Job Description:"),
+            *jd_parts(state.jd_json),
+            (REQUIRED, f"\nExperience entry to rewrite:\n{compact_experience(state.experience)}"),
+        ],
+        "experience_rewrite_node",
+    )
+
+
+BATCH_EXPERIENCE_REWRITE_SYSTEM_PROMPT = EXPERIENCE_REWRITE_SYSTEM_PROMPT + (
+    "\n\nBatch rules:\n"
+    "- You will receive several experience entries, indexed starting at 0.\n"
+    "- Rewrite each entry independently and return exactly one rewritten entry per input entry.\n"
+    "- Keep the output in the same order as the input."
+)
+
+
+def batch_experience_rewrite_user_prompt(jd_json, experiences):
+    entries = "\n\n".join(
+        f"[{i}] {compact_experience(e)}" for i, e in enumerate(experiences)
+    )
+    return fit(
+        [
+            (REQUIRED, "Job Description:"),
+            *jd_parts(jd_json),
+            (REQUIRED, f"\nExperience entries to rewrite:\n{entries}"),
+        ],
+        "batch_experience_rewrite_node",
+    )
@@ -1,11 +1,12 @@
 from pydantic import BaseModel
-from typing import Optional, Annotated, List
-import operator
+from typing import Optional, Annotated
+from agent.history import bounded_history
 from schemas import Experience
 
 
 class ExperienceSubgraphState(BaseModel):
     jd_json: dict
     experience: dict
-    experience_rewrite_messages: Annotated[List, operator.add] = []
+    experience_rewrite_messages: Annotated[list, bounded_history] = []
+    iteration: int = 0
     rewritten_experience: Optional[Experience] = None
@@ -3,31 +3,64 @@ from agent.subagents.project_rewrite.prompts import (
     project_rewrite_user_prompt,
 )
 from agent.subagents.project_rewrite.state import ProjectSubgraphState
-from langchain.chat_models import init_chat_model
 from schemas import ProjectRewriteResponse, HumanReviewResponse
 from langgraph.types import interrupt
 from typing import Literal
 from langgraph.graph import END
+from agent.llm import StructuredModel, call_model, current_thread_id
+from agent import speculation, stream
 
-model = init_chat_model("gpt-5-nano")
-project_rewrite_model = model.with_structured_output(ProjectRewriteResponse)
+project_rewrite_model = StructuredModel(ProjectRewriteResponse)
 
 
-def project_rewrite_node(state: ProjectSubgraphState):
+def initial_messages(jd_json: dict, project: dict) -> list:
+    state = ProjectSubgraphState(jd_json=jd_json, project=project)
+    return [
+        {"role": "system", "content": PROJECT_REWRITE_SYSTEM_PROMPT},
+        {"role": "user", "content": project_rewrite_user_prompt(state)},
+    ]
+
+
+async def draft_project_rewrite(jd_json: dict, project: dict) -> ProjectRewriteResponse:
+    """First rewrite of a project, identical to project_rewrite_node's first iteration."""
+    return await call_model(
+        project_rewrite_model, initial_messages(jd_json, project), node="project_rewrite_node"
+    )
+
+
+async def project_rewrite_node(state: ProjectSubgraphState):
     project_title = state.project.get("title", "?") if isinstance(state.project, dict) else "?"
-    iteration = len([m for m in state.project_rewrite_messages if m.get("role") == "user"]) + 1
+    iteration = state.iteration + 1
 
     print("\n--- project_rewrite_node ---")
     print(f"    project   : '{project_title}'")
     print(f"    iteration : {iteration}")
     print(f"    messages  : {len(state.project_rewrite_messages)} in history")
 
-    messages = state.project_rewrite_messages or [
-        {"role": "system", "content": PROJECT_REWRITE_SYSTEM_PROMPT},
-        {"role": "user", "content": project_rewrite_user_prompt(state)},
-    ]
+    messages = state.project_rewrite_messages or initial_messages(
+        state.jd_json, state.project
+    )
 
-    response = project_rewrite_model.invoke(messages)
+    partial, done = stream.publisher(
+        "project_rewrite_node", project_title, "rewritten_project"
+    )
+
+    response = None
+    if not state.project_rewrite_messages:
+        response = await speculation.adopt(
+            current_thread_id(), speculation.project_key(state.jd_json, state.project)
+        )
+        if response:
+            print("    adopted speculative draft")
+    if response is None:
+        response = await call_model(
+            project_rewrite_model,
+            messages,
+            node="project_rewrite_node",
+            iteration=iteration,
+            on_partial=partial,
+        )
+    await done(response.rewritten_project.model_dump(mode="json"))
 
     print(f"    produced  : {len(response.rewritten_project.bullets)} bullets")
     for b in response.rewritten_project.bullets:
@@ -45,10 +78,11 @@ def project_rewrite_node(state: ProjectSubgraphState):
     return {
         "rewritten_project": response.rewritten_project,
         "project_rewrite_messages": messages_to_store,
+        "iteration": iteration,
     }
 
 
-def project_rewrite_review_node(state: ProjectSubgraphState):
+async def project_rewrite_review_node(state: ProjectSubgraphState):
     project_title = state.rewritten_project.title if state.rewritten_project else "?"
 
     print("\n--- project_rewrite_review_node ---")
@@ -86,7 +120,7 @@ def project_rewrite_review_node(state: ProjectSubgraphState):
         }
 
 
-def should_rewrite_project(
+async def should_rewrite_project(
     state: ProjectSubgraphState,
 ) -> Literal["project_rewrite_node", "__end__"]:
     last = state.project_rewrite_messages[-1] if state.project_rewrite_messages else None
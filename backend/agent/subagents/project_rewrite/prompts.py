@@ -1,3 +1,5 @@
+from agent.compact import REQUIRED, compact_project, jd_parts, fit
+
 PROJECT_REWRITE_SYSTEM_PROMPT = (
     "You are a resume tailoring assistant.\n"
     "Your task is to rewrite project bullets so they better align with the job description.\n\n"
@@ -24,4 +26,11 @@ PROJECT_REWRITE_SYSTEM_PROMPT = (
 
 
 def project_rewrite_user_prompt(state):
-    return f"Job Description: {state.jd_json}\nProject to rewrite:\n{state.project}"
+    return fit(
+        [
+            (REQUIRED, "Job Description:"),
+            *jd_parts(state.jd_json),
+            (REQUIRED, f"\nProject to rewrite:\n{compact_project(state.project)}"),
+        ],
+        "project_rewrite_node",
+    )
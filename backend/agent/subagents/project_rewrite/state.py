@@ -1,11 +1,12 @@
 from pydantic import BaseModel
-from typing import Optional, Annotated, List
-import operator
+from typing import Optional, Annotated
+from agent.history import bounded_history
 from schemas import Project
 
 
 class ProjectSubgraphState(BaseModel):
     jd_json: dict
     project: dict
-    project_rewrite_messages: Annotated[List, operator.add] = []
+    project_rewrite_messages: Annotated[list, bounded_history] = []
+    iteration: int = 0
     rewritten_project: Optional[Project] = None
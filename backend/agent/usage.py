@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import UUID
+from sqlalchemy import func, Integer
+from sqlalchemy.orm import Session
+from db import SessionLocal
+from models import LLMUsage
+from config import settings
+
+# USD per million tokens
+MODEL_PRICES = {
+    "gpt-5-nano": {"input": 0.05, "cached_input": 0.005, "output": 0.40},
+}
+
+
+def estimate_cost(
+    model_name: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int
+) -> float:
+    prices = MODEL_PRICES.get(model_name)
+    if not prices:
+        return 0.0
+    return (
+        (prompt_tokens - cached_tokens) * prices["input"]
+        + cached_tokens * prices["cached_input"]
+        + completion_tokens * prices["output"]
+    ) / 1_000_000
+
+
+def application_id(thread_id: str) -> UUID | None:
+    # runs started by the API use the application id as their thread id
+    try:
+        return UUID(thread_id)
+    except ValueError:
+        return None
+
+
+def _write(row: dict):
+    with SessionLocal() as db:
+        db.add(LLMUsage(**row))
+        db.commit()
+
+
+async def record(
+    thread_id: str,
+    node: str,
+    iteration: int,
+    model_name: str,
+    usage: dict | None,
+    latency_ms: int,
+    cache_hit: bool = False,
+):
+    if not settings.LLM_USAGE_TRACKING:
+        return
+
+    usage = usage or {}
+    prompt_tokens = usage.get("input_tokens", 0)
+    completion_tokens = usage.get("output_tokens", 0)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    row = {
+        "application_id": application_id(thread_id),
+        "node": node,
+        "iteration": iteration,
+        "model": model_name,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "latency_ms": latency_ms,
+        "cost_usd": estimate_cost(
+            model_name, prompt_tokens, cached_tokens, completion_tokens
+        ),
+        "cache_hit": cache_hit,
+        "created_at": datetime.now(timezone.utc),
+    }
+    try:
+        await asyncio.to_thread(_write, row)
+    except Exception as e:
+        print(f"LLM usage write failed: {e}")
+
+
+def summarize(db: Session, *filters) -> dict:
+    """Totals over the matching usage rows, overall and per node."""
+    columns = (
+        func.count(LLMUsage.id),
+        func.coalesce(func.sum(LLMUsage.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.completion_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.cached_tokens), 0),
+        func.coalesce(func.sum(LLMUsage.latency_ms), 0),
+        func.coalesce(func.sum(LLMUsage.cost_usd), 0.0),
+        func.coalesce(func.sum(LLMUsage.cache_hit.cast(Integer)), 0),
+    )
+
+    def as_dict(row) -> dict:
+        calls, prompt, completion, cached, latency, cost, cache_hits = row
+        return {
+            "calls": calls,
+            "cache_hits": cache_hits,
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "cached_tokens": cached,
+            "latency_ms": latency,
+            "avg_latency_ms": round(latency / calls) if calls else 0,
+            "cost_usd": round(cost, 6),
+        }
+
+    total = db.query(*columns).filter(*filters).one()
+    by_node = (
+        db.query(LLMUsage.node, *columns)
+        .filter(*filters)
+        .group_by(LLMUsage.node)
+        .order_by(LLMUsage.node)
+        .all()
+    )
+    return {
+        "total": as_dict(total),
+        "by_node": {row[0]: as_dict(row[1:]) for row in by_node},
+    }
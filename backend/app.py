@@ -1,13 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from db import init_db
+from db import init_db, async_engine
+from agent.checkpointer import open_checkpointer, close_checkpointer
+from agent.graph import tailor_agent
+from utils import progress
 from routes.health import route as health_route
 from routes.auth import route as login_route
 from routes.user import route as user_route
 from routes.resume import route as resume_route
 from routes.applications import route as applications_route
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    tailor_agent.checkpointer = await open_checkpointer()
+    progress.start_listener()
+    yield
+    await progress.stop_listener()
+    await close_checkpointer()
+    await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -15,20 +32,18 @@ origins = [
     "https://resume-tailor-omega.vercel.app",
 ]
 
+# SSE responses are left uncompressed by the middleware itself
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
-@app.on_event("startup")
-def on_startup():
-    init_db()
-
-
 app.include_router(health_route)
 app.include_router(login_route)
 app.include_router(user_route)
@@ -0,0 +1,62 @@
+"""Concurrent-application throughput: blocking model calls vs native async.
+
+    python -m benchmarks.concurrent_applications --applications 200 --latency 1.0
+
+"blocking" runs every model call as ``time.sleep`` on the default executor,
+which is how the synchronous nodes behaved: each Send branch pinned a thread
+for its whole round-trip. "async" awaits the same latency on the event loop.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from benchmarks.fakes import install_fake_models, in_memory_agent, run_application
+
+
+async def run(mode: str, applications: int, latency: float) -> dict:
+    install_fake_models(latency, blocking=mode == "blocking")
+    agent = in_memory_agent()
+
+    peak_threads = threading.active_count()
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while True:
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.05)
+
+    sampler = asyncio.create_task(sample_threads())
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(run_application(agent, f"{mode}-{i}") for i in range(applications))
+    )
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "throughput": applications / elapsed,
+        "peak_threads": peak_threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"{args.applications} applications, {args.latency}s per model call\n")
+    print(f"{'mode':<10}{'elapsed (s)':>14}{'apps/s':>10}{'peak threads':>15}")
+    for mode in ("blocking", "async"):
+        result = asyncio.run(run(mode, args.applications, args.latency))
+        print(
+            f"{result['mode']:<10}{result['elapsed']:>14.2f}"
+            f"{result['throughput']:>10.2f}{result['peak_threads']:>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Per-stage timing of the tailor graph: old linear chain vs parallel branches.
+
+    python -m benchmarks.critical_path --latency 1.0
+
+Both graphs use the same nodes and fake models with a fixed latency; reviews
+are approved instantly, so the totals are pure agent time. The linear graph is
+the previous topology (every stage chained, experience rewrites after the
+project join). Set SPECULATIVE_PROJECT_REWRITE=false to time the graph change
+on its own.
+"""
+
+import argparse
+import asyncio
+import time
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Command
+from agent import nodes
+from agent.state import TailorState
+from benchmarks.fakes import (
+    install_fake_models,
+    approve_all,
+    SAMPLE_JD_HTML,
+    SAMPLE_RESUME,
+)
+
+
+def linear_graph():
+    graph = StateGraph(TailorState)
+    for name in (
+        "jd_parsing_node",
+        "skill_match_node",
+        "project_selection_node",
+        "project_selection_review_node",
+        "skill_selection_node",
+        "skill_selection_review_node",
+        "execute_project_rewrite_node",
+        "project_join_node",
+        "execute_experience_rewrite_node",
+        "assemble_resume_node",
+    ):
+        graph.add_node(name, getattr(nodes, name))
+
+    graph.add_edge(START, "jd_parsing_node")
+    graph.add_edge("jd_parsing_node", "skill_match_node")
+    graph.add_edge("skill_match_node", "project_selection_node")
+    graph.add_edge("project_selection_node", "project_selection_review_node")
+    graph.add_conditional_edges(
+        "project_selection_review_node",
+        nodes.should_reselect_projects,
+        ["project_selection_node", "skill_selection_node"],
+    )
+    graph.add_edge("skill_selection_node", "skill_selection_review_node")
+    graph.add_conditional_edges(
+        "skill_selection_review_node",
+        nodes.continue_to_project_rewrite_node,
+        ["execute_project_rewrite_node"],
+    )
+    graph.add_edge("execute_project_rewrite_node", "project_join_node")
+    graph.add_conditional_edges(
+        "project_join_node",
+        nodes.continue_to_experience_rewrite_node,
+        ["execute_experience_rewrite_node"],
+    )
+    graph.add_edge("execute_experience_rewrite_node", "assemble_resume_node")
+    graph.add_edge("assemble_resume_node", END)
+    return graph.compile(checkpointer=InMemorySaver())
+
+
+def parallel_graph():
+    from agent.graph import tailor_agent
+
+    tailor_agent.checkpointer = InMemorySaver()
+    return tailor_agent
+
+
+async def timed_run(agent) -> tuple[dict, float, float]:
+    """Returns ({node: (first start, last end)}, time to first interrupt, end to end)."""
+    config = {"configurable": {"thread_id": "critical-path"}}
+    stages = {}
+    started = time.perf_counter()
+    first_interrupt = None
+    payload = {"raw_html": SAMPLE_JD_HTML, "resume_json": SAMPLE_RESUME}
+
+    while True:
+        async for event in agent.astream_events(payload, config=config, version="v2"):
+            node = event.get("metadata", {}).get("langgraph_node", "")
+            if event["name"] != node or node.startswith("__"):
+                continue
+            now = time.perf_counter() - started
+            first, last = stages.get(node, (now, now))
+            if event["event"] == "on_chain_start":
+                stages[node] = (min(first, now), last)
+            elif event["event"] == "on_chain_end":
+                stages[node] = (first, max(last, now))
+
+        state = await agent.aget_state(config)
+        if first_interrupt is None:
+            first_interrupt = time.perf_counter() - started
+        if not state.next:
+            break
+        payload = Command(resume=approve_all(state.interrupts))
+
+    return stages, first_interrupt, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    install_fake_models(args.latency)
+    results = {
+        "linear": asyncio.run(timed_run(linear_graph())),
+        "parallel": asyncio.run(timed_run(parallel_graph())),
+    }
+
+    for name, (stages, _, _) in results.items():
+        print(f"\n{name} graph ({args.latency}s per model call)")
+        print(f"  {'stage':<34}{'start (s)':>10}{'end (s)':>10}")
+        for node, (first, last) in sorted(stages.items(), key=lambda s: s[1]):
+            print(f"  {node:<34}{first:>10.2f}{last:>10.2f}")
+
+    print(f"\n{'':<10}{'first interrupt (s)':>21}{'end to end (s)':>16}")
+    for name, (_, first_interrupt, total) in results.items():
+        print(f"{name:<10}{first_interrupt:>21.2f}{total:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
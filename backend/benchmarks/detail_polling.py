@@ -0,0 +1,131 @@
+"""Latency of the application detail load under polling: before and after
+the single-query loader.
+
+    python -m benchmarks.detail_polling --pollers 20 --polls 50 --steps 12
+
+Every poller reads the same application over and over on a fresh session, the
+way the detail page polls while a run is in progress. "previous" is the old
+get_application body: the application, its steps through selectinload, the
+resume in a third query, and ResumeSchema validated on every read. "single"
+is load_application_detail: one joined query, the validated resume reused
+from resume_cache. The validator query that both modes run first, and that
+answers 304s on its own, is left out. A throwaway SQLite file on aiosqlite
+stands in for the database.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import selectinload
+from db import Base
+from models import User, Resume, Application, ApplicationStep
+from routes.applications import load_application_detail
+from schemas import ApplicationResponse, ResumeSchema
+from utils import resume_cache
+from benchmarks.fakes import SAMPLE_RESUME, SAMPLE_JD
+
+
+async def previous_detail(db, application_id, user_id):
+    application = await db.scalar(
+        select(Application)
+        .where(Application.id == application_id, Application.user_id == user_id)
+        .options(selectinload(Application.steps))
+    )
+    resume = await db.scalar(select(Resume).where(Resume.user_id == user_id))
+    result = ApplicationResponse.model_validate(application)
+    result.resume_json = ResumeSchema(**resume.resume_json) if resume else None
+    return result
+
+
+def seed(db, steps: int):
+    user = User(name="Bench", email="bench@example.com", password_hash="-")
+    db.add(user)
+    db.flush()
+    resume = Resume(user_id=user.id, resume_json=SAMPLE_RESUME.model_dump())
+    application = Application(user_id=user.id, job_id="bench")
+    db.add_all([resume, application])
+    db.flush()
+    db.add_all(
+        ApplicationStep(
+            application_id=application.id,
+            node="jd_parsing_node",
+            label=f"Step {i}",
+            data={"jd_json": SAMPLE_JD.model_dump()},
+        )
+        for i in range(steps)
+    )
+    db.commit()
+    return application.id, user.id
+
+
+async def run(mode: str, pollers: int, polls: int, steps: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "detail.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with Session() as db:
+        application_id, user_id = await db.run_sync(seed, steps)
+        # as the route's validator query reads it back
+        resume_updated_at = await db.scalar(select(Resume.updated_at))
+
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    async def poll(latencies: list[float]):
+        for _ in range(polls):
+            started = time.perf_counter()
+            async with Session() as db:
+                if mode == "previous":
+                    await previous_detail(db, application_id, user_id)
+                else:
+                    await load_application_detail(
+                        db, application_id, user_id, resume_updated_at
+                    )
+            latencies.append(time.perf_counter() - started)
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(poll(latencies) for _ in range(pollers)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "statements": statements / len(latencies),
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1000,
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pollers", type=int, default=20)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=12)
+    args = parser.parse_args()
+
+    print(f"{args.pollers} pollers x {args.polls} reads, {args.steps} steps\n")
+    print(f"{'mode':<10}{'queries/read':>14}{'p50 ms':>9}{'p99 ms':>9}{'elapsed (s)':>13}")
+    for mode in ("previous", "single"):
+        r = asyncio.run(run(mode, args.pollers, args.polls, args.steps))
+        print(
+            f"{r['mode']:<10}{r['statements']:>14.1f}{r['p50']:>9.1f}"
+            f"{r['p99']:>9.1f}{r['elapsed']:>13.2f}"
+        )
+    print(f"\nresume_cache: {resume_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
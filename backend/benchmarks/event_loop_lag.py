@@ -0,0 +1,110 @@
+"""Event-loop lag while route handlers run queries: sync Session vs AsyncSession.
+
+    python -m benchmarks.event_loop_lag --requests 200 --concurrency 20
+    python -m benchmarks.event_loop_lag --postgres      # the .env database
+
+"sync" runs each query the way the routes used to: a sync Session called
+straight from an ``async def`` handler, so the event loop waits for the
+database. "async" awaits the same query on an AsyncSession. A probe task
+sleeps 10ms at a time the whole while. How late it wakes up is the lag every
+other coroutine on the loop sees, SSE streams included.
+
+By default the slow query is a recursive count in a throwaway SQLite file
+(aiosqlite for the async side). With --postgres it is ``pg_sleep`` against the
+configured database.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+PROBE_INTERVAL = 0.01
+
+
+def engines(postgres: bool):
+    if postgres:
+        from db import DATABASE_URL
+
+        return (
+            create_engine(DATABASE_URL),
+            create_async_engine(
+                DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+            ),
+            text("SELECT pg_sleep(0.02)"),
+        )
+    path = os.path.join(tempfile.mkdtemp(), "lag.db")
+    return (
+        create_engine(f"sqlite:///{path}"),
+        create_async_engine(f"sqlite+aiosqlite:///{path}"),
+        text(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+            "WHERE x < 50000) SELECT count(*) FROM c"
+        ),
+    )
+
+
+async def probe(lags: list[float], done: asyncio.Event):
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def run(mode: str, requests: int, concurrency: int, postgres: bool) -> dict:
+    sync_engine, async_engine, query = engines(postgres)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def handler():
+        async with slots:
+            if mode == "sync":
+                with sync_engine.connect() as conn:
+                    conn.execute(query).scalar()
+            else:
+                async with async_engine.connect() as conn:
+                    (await conn.execute(query)).scalar()
+
+    lags: list[float] = []
+    done = asyncio.Event()
+    prober = asyncio.create_task(probe(lags, done))
+    started = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "p50": statistics.median(lags) * 1000,
+        "p99": lags[int(len(lags) * 0.99)] * 1000,
+        "max": lags[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--postgres", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} at a time\n")
+    print(f"{'mode':<8}{'elapsed (s)':>13}{'lag p50 ms':>12}{'p99 ms':>9}{'max ms':>9}")
+    for mode in ("sync", "async"):
+        r = asyncio.run(run(mode, args.requests, args.concurrency, args.postgres))
+        print(
+            f"{r['mode']:<8}{r['elapsed']:>13.2f}{r['p50']:>12.1f}"
+            f"{r['p99']:>9.1f}{r['max']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Per-entry vs batched experience rewriting: requests, prompt tokens, latency.
+
+    python -m benchmarks.experience_rewrite_modes            # prompt sizes only
+    python -m benchmarks.experience_rewrite_modes --live     # also call the model
+
+Without ``--live`` the prompt token counts are estimates from agent.llm.
+With it, both modes run against the real model (per-entry calls concurrently,
+as the Send fan-out does) and report provider-counted usage and wall time.
+"""
+
+import argparse
+import asyncio
+import time
+from agent.llm import model, estimate_tokens
+from agent.subagents.experience_rewrite.prompts import (
+    EXPERIENCE_REWRITE_SYSTEM_PROMPT,
+    experience_rewrite_user_prompt,
+    BATCH_EXPERIENCE_REWRITE_SYSTEM_PROMPT,
+    batch_experience_rewrite_user_prompt,
+)
+from agent.subagents.experience_rewrite.state import ExperienceSubgraphState
+from benchmarks.fakes import SAMPLE_RESUME, SAMPLE_JD
+from schemas import ExperienceRewriteResponse, BatchExperienceRewriteResponse
+
+
+def per_entry_requests(jd_json: dict, experiences: list[dict]) -> list[list]:
+    return [
+        [
+            {"role": "system", "content": EXPERIENCE_REWRITE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": experience_rewrite_user_prompt(
+                    ExperienceSubgraphState(jd_json=jd_json, experience=e)
+                ),
+            },
+        ]
+        for e in experiences
+    ]
+
+
+def batched_requests(jd_json: dict, experiences: list[dict]) -> list[list]:
+    return [
+        [
+            {"role": "system", "content": BATCH_EXPERIENCE_REWRITE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": batch_experience_rewrite_user_prompt(jd_json, experiences),
+            },
+        ]
+    ]
+
+
+async def run_live(requests: list[list], schema) -> tuple[float, int, int]:
+    structured = model.with_structured_output(schema, include_raw=True)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(structured.ainvoke(m) for m in requests))
+    elapsed = time.perf_counter() - started
+    usage = [r["raw"].usage_metadata or {} for r in results]
+    return (
+        elapsed,
+        sum(u.get("input_tokens", 0) for u in usage),
+        sum(u.get("output_tokens", 0) for u in usage),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=len(SAMPLE_RESUME.experience))
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    jd_json = SAMPLE_JD.model_dump()
+    base = [e.model_dump() for e in SAMPLE_RESUME.experience]
+    experiences = [base[i % len(base)] for i in range(args.entries)]
+
+    modes = {
+        "per_entry": (per_entry_requests(jd_json, experiences), ExperienceRewriteResponse),
+        "batched": (batched_requests(jd_json, experiences), BatchExperienceRewriteResponse),
+    }
+
+    print(f"{args.entries} experience entries\n")
+    header = f"{'mode':<11}{'requests':>10}{'est. prompt tokens':>20}"
+    if args.live:
+        header += f"{'prompt tokens':>15}{'output tokens':>15}{'latency (s)':>13}"
+    print(header)
+
+    for name, (requests, schema) in modes.items():
+        row = (
+            f"{name:<11}{len(requests):>10}"
+            f"{sum(estimate_tokens(m) for m in requests):>20}"
+        )
+        if args.live:
+            elapsed, prompt_tokens, output_tokens = asyncio.run(run_live(requests, schema))
+            row += f"{prompt_tokens:>15}{output_tokens:>15}{elapsed:>13.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
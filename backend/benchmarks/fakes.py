@@ -0,0 +1,197 @@
+"""Offline stand-ins for the LLM clients, used by the benchmark scripts.
+
+Every fake answers after a fixed latency so graph-level changes can be timed
+without calling the provider. Run the benchmarks from ``backend/`` with the
+usual ``.env`` in place (the agent modules read settings on import).
+"""
+
+import asyncio
+import time
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+from schemas import (
+    ResumeSchema,
+    JDResponseSchema,
+    SemanticMatchResponseSchema,
+    SkillPair,
+    ProjectSelectResponseSchema,
+    SkillSelectionResponse,
+    ProjectRewriteResponse,
+    ExperienceRewriteResponse,
+    BatchExperienceRewriteResponse,
+    SkillCategory,
+    Project,
+    Experience,
+)
+
+SAMPLE_RESUME = ResumeSchema(
+    name="Jane Doe",
+    email="jane@example.com",
+    summary="Backend engineer focused on data-heavy Python services.",
+    skills=[
+        SkillCategory(category="Languages", skills=["Python", "TypeScript", "SQL"]),
+        SkillCategory(category="Frameworks", skills=["FastAPI", "React", "PyTorch"]),
+        SkillCategory(category="Infrastructure", skills=["Docker", "k8s", "AWS", "Postgres"]),
+    ],
+    experience=[
+        Experience(
+            company=f"Company {i}",
+            role="Software Engineer",
+            technologies=["Python", "Postgres"],
+            bullets=[
+                "Built ingestion services that processed millions of events a day.",
+                "Cut p99 API latency by 40% by introducing query caching.",
+                "Mentored two junior engineers through their first launches.",
+            ],
+        )
+        for i in range(3)
+    ],
+    projects=[
+        Project(
+            title=f"Project {i}",
+            description="A side project.",
+            technologies=["Python", "FastAPI", "React"][: 1 + i % 3],
+            bullets=[
+                "Designed and shipped an end-to-end web application.",
+                "Automated deployment with Docker and GitHub Actions.",
+            ],
+        )
+        for i in range(6)
+    ],
+    education=[],
+)
+
+SAMPLE_JD_HTML = (
+    "<div><p>We are hiring a backend engineer.</p><ul>"
+    "<li>Python, FastAPI and PostgreSQL</li><li>Kubernetes and Docker</li>"
+    "<li>Nice to have: React, Terraform</li></ul></div>"
+)
+
+SAMPLE_JD = JDResponseSchema(
+    location="Remote",
+    responsibilities=["Build backend services", "Own deployments"],
+    must_have_qualifications=["Python", "FastAPI", "PostgreSQL", "Kubernetes", "Docker"],
+    nice_to_have_qualifications=["React", "Terraform"],
+    keywords=["Python", "FastAPI", "PostgreSQL", "Kubernetes", "Docker"],
+)
+
+RESPONSES = {
+    JDResponseSchema: lambda: SAMPLE_JD,
+    SemanticMatchResponseSchema: lambda: SemanticMatchResponseSchema(
+        matched_must_have=["postgresql", "kubernetes"],
+        matched_nice_to_have=[],
+        matched_pairs=[
+            SkillPair(jd_skill="postgresql", resume_skill="postgres"),
+            SkillPair(jd_skill="kubernetes", resume_skill="k8s"),
+        ],
+    ),
+    ProjectSelectResponseSchema: lambda: ProjectSelectResponseSchema(
+        selected_project_indexes=[0, 1, 2]
+    ),
+    SkillSelectionResponse: lambda: SkillSelectionResponse(
+        selected_skills=SAMPLE_RESUME.skills
+    ),
+    ProjectRewriteResponse: lambda: ProjectRewriteResponse(
+        rewritten_project=SAMPLE_RESUME.projects[0]
+    ),
+    ExperienceRewriteResponse: lambda: ExperienceRewriteResponse(
+        rewritten_experience=SAMPLE_RESUME.experience[0]
+    ),
+    BatchExperienceRewriteResponse: lambda: BatchExperienceRewriteResponse(
+        rewritten_experiences=[
+            ExperienceRewriteResponse(rewritten_experience=e)
+            for e in SAMPLE_RESUME.experience
+        ]
+    ),
+}
+
+
+class FakeStructuredModel:
+    """Answers with a canned ``schema`` instance after ``latency`` seconds.
+
+    ``blocking=True`` reproduces the old synchronous nodes: the wait happens
+    in ``time.sleep`` on the default executor, so every in-flight call pins a
+    thread. Otherwise it waits with ``asyncio.sleep`` on the event loop.
+    """
+
+    def __init__(self, schema, latency: float, blocking: bool = False):
+        self.schema = schema
+        self.model_name = "fake"
+        self.latency = latency
+        self.blocking = blocking
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return RESPONSES[self.schema](), None
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        if self.blocking:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.invoke, messages)
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return RESPONSES[self.schema](), None
+
+
+def install_fake_models(latency: float, blocking: bool = False) -> dict:
+    """Swap every model client the graph uses for a fake; returns them by name.
+
+    The response cache is switched off so every run pays the fake latency, and
+    the skill alias table and usage tracking are switched off so no database
+    is needed.
+    """
+    from config import settings
+    import agent.llm as llm
+    import agent.nodes as nodes
+    import agent.subagents.project_rewrite.nodes as project_nodes
+    import agent.subagents.experience_rewrite.nodes as experience_nodes
+
+    targets = {
+        "jd_parsing_model": (nodes, JDResponseSchema),
+        "semantic_skill_match_model": (nodes, SemanticMatchResponseSchema),
+        "project_selection_model": (nodes, ProjectSelectResponseSchema),
+        "skill_selection_model": (nodes, SkillSelectionResponse),
+        "batch_experience_rewrite_model": (nodes, BatchExperienceRewriteResponse),
+        "project_rewrite_model": (project_nodes, ProjectRewriteResponse),
+        "experience_rewrite_model": (experience_nodes, ExperienceRewriteResponse),
+    }
+    llm.cache.nodes = set()
+    settings.SKILL_ALIASES_ENABLED = False
+    settings.LLM_USAGE_TRACKING = False
+    fakes = {}
+    for name, (module, schema) in targets.items():
+        fakes[name] = FakeStructuredModel(schema, latency, blocking)
+        setattr(module, name, fakes[name])
+    return fakes
+
+
+def approve_all(interrupts) -> dict:
+    resume_map = {}
+    for i in interrupts:
+        value = i.value or {}
+        response = {"approved": True}
+        if "selected_skills" in value:
+            response["edited_skills"] = value["selected_skills"]
+        resume_map[i.id] = response
+    return resume_map
+
+
+async def run_application(agent, thread_id: str) -> None:
+    """Drive one application to completion, approving every review."""
+    config = {"configurable": {"thread_id": thread_id}}
+    await agent.ainvoke(
+        {"raw_html": SAMPLE_JD_HTML, "resume_json": SAMPLE_RESUME}, config=config
+    )
+    state = await agent.aget_state(config)
+    while state.next:
+        await agent.ainvoke(Command(resume=approve_all(state.interrupts)), config=config)
+        state = await agent.aget_state(config)
+
+
+def in_memory_agent():
+    from agent.graph import tailor_agent
+
+    tailor_agent.checkpointer = InMemorySaver()
+    return tailor_agent
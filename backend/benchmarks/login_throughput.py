@@ -0,0 +1,98 @@
+"""Login throughput and tail latency during a burst: argon2 on the shared
+default threadpool vs the dedicated, bounded executor.
+
+    python -m benchmarks.login_throughput --logins 64
+
+All logins arrive at once and verify the same stored hash. "shared" verifies
+with asyncio.to_thread, as the login route used to. "dedicated" goes through
+security.password.verify_password, which runs PASSWORD_HASH_WORKERS hashes at
+a time, queues PASSWORD_HASH_MAX_QUEUE more and turns the rest away with a
+503. Meanwhile a probe makes a trivial to_thread call every 20ms, standing in
+for the other work on the default pool (sync endpoints, the agent's database
+helpers); its p99 is how long that work waited behind the burst.
+
+Argon2 costs and the executor size come from the usual settings.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from fastapi import HTTPException
+from security.password import password_hash, verify_password
+
+PROBE_INTERVAL = 0.02
+
+
+async def probe(waits: list[float], done: asyncio.Event):
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.to_thread(lambda: None)
+        waits.append(time.perf_counter() - started)
+        await asyncio.sleep(PROBE_INTERVAL)
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000 if values else 0.0
+
+
+async def run(mode: str, logins: int, hashed: str) -> dict:
+    latencies: list[float] = []
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        started = time.perf_counter()
+        try:
+            if mode == "shared":
+                await asyncio.to_thread(password_hash.verify_and_update, "secret123", hashed)
+            else:
+                await verify_password("secret123", hashed)
+        except HTTPException:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - started)
+
+    waits: list[float] = []
+    done = asyncio.Event()
+    prober = asyncio.create_task(probe(waits, done))
+    await asyncio.sleep(0.1)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    return {
+        "mode": mode,
+        "ok": len(latencies),
+        "rejected": rejected,
+        "per_second": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99": percentile(latencies, 0.99),
+        "probe_p99": percentile(waits, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    hashed = password_hash.hash("secret123")
+    print(f"burst of {args.logins} logins\n")
+    print(
+        f"{'mode':<11}{'ok':>5}{'503':>6}{'logins/s':>10}{'p50 ms':>9}"
+        f"{'p99 ms':>9}{'probe p99 ms':>14}"
+    )
+    for mode in ("shared", "dedicated"):
+        r = asyncio.run(run(mode, args.logins, hashed))
+        print(
+            f"{r['mode']:<11}{r['ok']:>5}{r['rejected']:>6}{r['per_second']:>10.1f}"
+            f"{r['p50']:>9.1f}{r['p99']:>9.1f}{r['probe_p99']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Database round-trips per run for graph_stream's progress writes.
+
+    python -m benchmarks.progress_writes --applications 5 --latency 0.05
+
+Each application runs the fake-model graph to completion, approving every
+review. Its node-start and step events are recorded against a throwaway
+SQLite database. "per-event" replays the previous graph_stream on a sync
+session: a SELECT of the application, then an UPDATE or INSERT, then a COMMIT
+for every event. "coalesced" goes through ProgressWriter on aiosqlite. Only the
+progress writes are counted; the final-state write is the same in both and is
+left out.
+"""
+
+import argparse
+import asyncio
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from langgraph.types import Command
+from db import Base
+from models import User, Application, ApplicationStep
+from routes.applications import NODE_LABELS, STRUCTURED_OUTPUT_NODES
+from utils.progress_writer import ProgressWriter
+from utils.serialize import serialize_output
+from benchmarks.fakes import (
+    install_fake_models,
+    in_memory_agent,
+    approve_all,
+    SAMPLE_JD_HTML,
+    SAMPLE_RESUME,
+)
+
+
+class PerEventWriter:
+    def __init__(self, db, application_id):
+        self.db = db
+        self.application_id = application_id
+
+    def _application(self):
+        return (
+            self.db.query(Application)
+            .filter(Application.id == self.application_id)
+            .first()
+        )
+
+    async def node(self, node):
+        self._application().current_node = node
+        self.db.commit()
+
+    async def step(self, node, label, data):
+        self.db.add(
+            ApplicationStep(
+                application_id=self.application_id, node=node, label=label, data=data
+            )
+        )
+        self._application().current_node = node
+        self.db.commit()
+
+    async def flush(self):
+        pass
+
+
+async def run_application(agent, writer, thread_id: str):
+    config = {"configurable": {"thread_id": thread_id}}
+    graph_input = {"raw_html": SAMPLE_JD_HTML, "resume_json": SAMPLE_RESUME}
+    while True:
+        async for e in agent.astream_events(graph_input, config=config, version="v2"):
+            node = e.get("metadata", {}).get("langgraph_node", "")
+            if e["name"] != node:
+                continue
+            if e["event"] == "on_chain_start" and node in NODE_LABELS:
+                await writer.node(node)
+            elif e["event"] == "on_chain_end" and node in STRUCTURED_OUTPUT_NODES:
+                output = serialize_output(e["data"].get("output", {}))
+                await writer.step(node, NODE_LABELS[node], output)
+        await writer.flush()
+        state = await agent.aget_state(config)
+        if not state.next:
+            return
+        graph_input = Command(resume=approve_all(state.interrupts))
+
+
+def seed(db, applications: int) -> list:
+    user = User(name="Bench", email="bench@example.com", password_hash="-")
+    db.add(user)
+    db.flush()
+    apps = [
+        Application(user_id=user.id, job_id=f"bench-{i}") for i in range(applications)
+    ]
+    db.add_all(apps)
+    db.commit()
+    return [a.id for a in apps]
+
+
+async def run(mode: str, applications: int) -> dict:
+    sessions = []
+    if mode == "per-event":
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            app_ids = seed(db, applications)
+        sessions = [Session() for _ in app_ids]
+        writers = [PerEventWriter(db, app_id) for db, app_id in zip(sessions, app_ids)]
+        sync_engine = engine
+    else:
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        async with Session() as db:
+            app_ids = await db.run_sync(seed, applications)
+        writers = [
+            ProgressWriter(app_id, session_factory=Session) for app_id in app_ids
+        ]
+        sync_engine = engine.sync_engine
+
+    counts = {"statements": 0, "commits": 0}
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        counts["statements"] += 1
+
+    @event.listens_for(sync_engine, "commit")
+    def count_commit(*args):
+        counts["commits"] += 1
+
+    agent = in_memory_agent()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_application(agent, writer, f"{mode}-{i}")
+            for i, writer in enumerate(writers)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    for db in sessions:
+        db.close()
+    if mode != "per-event":
+        await engine.dispose()
+
+    return {
+        "mode": mode,
+        "statements": counts["statements"] / applications,
+        "commits": counts["commits"] / applications,
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--applications", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    install_fake_models(args.latency)
+    print(f"{args.applications} applications, {args.latency}s per model call\n")
+    print(f"{'mode':<12}{'statements/run':>16}{'commits/run':>13}{'elapsed (s)':>13}")
+    for mode in ("per-event", "coalesced"):
+        result = asyncio.run(run(mode, args.applications))
+        print(
+            f"{result['mode']:<12}{result['statements']:>16.1f}"
+            f"{result['commits']:>13.1f}{result['elapsed']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Estimated prompt tokens per node: old repr-based prompts vs compact ones.
+
+    python -m benchmarks.prompt_tokens                     # the sample resume
+    python -m benchmarks.prompt_tokens resumes/*.json      # ResumeSchema files
+    python -m benchmarks.prompt_tokens --from-db 50        # latest parsed resumes
+
+Every resume is paired with the sample JD. The "old" column rebuilds each user
+prompt the way it was written before the compact serializer (pydantic reprs
+and raw HTML); the "new" column calls the current prompt builders, including
+their token budgets. System prompts are unchanged and left out.
+"""
+
+import argparse
+import json
+from agent.llm import estimate_tokens
+from agent.prompts import (
+    skill_match_user_prompt,
+    project_selection_user_prompt,
+    skill_selection_user_prompt,
+)
+from agent.project_ranking import rank_projects
+from agent.state import TailorState
+from agent.subagents.project_rewrite.prompts import project_rewrite_user_prompt
+from agent.subagents.project_rewrite.state import ProjectSubgraphState
+from agent.subagents.experience_rewrite.prompts import (
+    experience_rewrite_user_prompt,
+    batch_experience_rewrite_user_prompt,
+)
+from agent.subagents.experience_rewrite.state import ExperienceSubgraphState
+from agent.compact import compact_html
+from benchmarks.fakes import SAMPLE_JD, SAMPLE_JD_HTML, SAMPLE_RESUME
+from config import settings
+from schemas import ResumeSchema, SkillMatchResultSchema
+
+
+def load_resumes(paths: list[str], from_db: int) -> list[ResumeSchema]:
+    if from_db:
+        from db import SessionLocal
+        from models import Resume, ResumeStatus
+
+        with SessionLocal() as db:
+            rows = (
+                db.query(Resume)
+                .filter(Resume.status == ResumeStatus.SUCCESS)
+                .order_by(Resume.updated_at.desc())
+                .limit(from_db)
+                .all()
+            )
+            return [ResumeSchema(**r.resume_json) for r in rows]
+    if paths:
+        resumes = []
+        for path in paths:
+            with open(path) as f:
+                resumes.append(ResumeSchema(**json.load(f)))
+        return resumes
+    return [SAMPLE_RESUME]
+
+
+def skill_results(resume: ResumeSchema) -> SkillMatchResultSchema:
+    skills = {s.lower() for c in resume.skills for s in c.skills}
+    must = {s.lower() for s in SAMPLE_JD.must_have_qualifications}
+    return SkillMatchResultSchema(
+        matched_must_have=must & skills,
+        missing_must_have=must - skills,
+        matched_nice_to_have=set(),
+        missing_nice_to_have=set(),
+        must_have_score=0,
+        nice_to_have_score=0,
+        final_score=0,
+    )
+
+
+def prompts(resume: ResumeSchema) -> dict[str, tuple[list[str], list[str]]]:
+    """{node: (old user prompts, new user prompts)} for one resume."""
+    jd = SAMPLE_JD.model_dump()
+    state = TailorState(
+        jd_json=SAMPLE_JD, resume_json=resume, skill_match_results=skill_results(resume)
+    )
+    skills = {s.lower() for c in resume.skills for s in c.skills}
+    missing = {s.lower() for s in SAMPLE_JD.must_have_qualifications} - skills
+    ranking = rank_projects(SAMPLE_JD, resume.projects)
+    candidates = [
+        resume.projects[r["index"]] for r in ranking[: settings.PROJECT_RANK_TOP_K]
+    ]
+    projects = [p.model_dump() for p in resume.projects]
+    experiences = [e.model_dump() for e in resume.experience]
+
+    return {
+        "jd_parsing_node": (
+            [f"JD:\n{SAMPLE_JD_HTML}"],
+            [f"JD:\n{compact_html(SAMPLE_JD_HTML)}"],
+        ),
+        "skill_match_node": (
+            [
+                f"Resume skills: {list(skills)}\n\n"
+                f"Unmatched must-have JD skills: {list(missing)}\n"
+                f"Unmatched nice-to-have JD skills: {list()}\n\n"
+                f"Which unmatched JD skills are semantically covered by the resume skills?"
+            ],
+            [skill_match_user_prompt(skills, missing, set())],
+        ),
+        "project_selection_node": (
+            [
+                f"Job Description:\n{SAMPLE_JD}\n\n"
+                f"Projects (indexed starting at 0):\n{resume.projects}"
+            ],
+            [project_selection_user_prompt(SAMPLE_JD, candidates)],
+        ),
+        "skill_selection_node": (
+            [
+                f"JD Keywords: {SAMPLE_JD.keywords}\n"
+                f"Must-have skills: {state.skill_match_results.matched_must_have}\n"
+                f"Missing skills: {state.skill_match_results.missing_must_have}\n\n"
+                f"Candidate skills: {resume.skills}"
+            ],
+            [skill_selection_user_prompt(state)],
+        ),
+        "project_rewrite_node": (
+            [f"Job Description: {jd}\nProject to rewrite:\n{p}" for p in projects[:3]],
+            [
+                project_rewrite_user_prompt(ProjectSubgraphState(jd_json=jd, project=p))
+                for p in projects[:3]
+            ],
+        ),
+        "experience_rewrite_node": (
+            [f"Job Description: {jd}\nExperience entry to rewrite:\n{e}" for e in experiences],
+            [
+                experience_rewrite_user_prompt(
+                    ExperienceSubgraphState(jd_json=jd, experience=e)
+                )
+                for e in experiences
+            ],
+        ),
+        "batch_experience_rewrite_node": (
+            [
+                f"Job Description: {jd}\nExperience entries to rewrite:\n"
+                + "\n".join(f"[{i}] {e}" for i, e in enumerate(experiences))
+            ],
+            [batch_experience_rewrite_user_prompt(jd, experiences)],
+        ),
+    }
+
+
+def tokens(texts: list[str]) -> int:
+    return sum(estimate_tokens([{"content": t}]) for t in texts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--from-db", type=int, default=0)
+    args = parser.parse_args()
+
+    resumes = load_resumes(args.paths, args.from_db)
+    totals: dict[str, list[int]] = {}
+    for resume in resumes:
+        for node, (old, new) in prompts(resume).items():
+            counts = totals.setdefault(node, [0, 0])
+            counts[0] += tokens(old)
+            counts[1] += tokens(new)
+
+    print(f"{len(resumes)} resume(s), estimated user-prompt tokens per resume\n")
+    print(f"{'node':<32}{'old':>8}{'new':>8}{'saved':>8}")
+    for node, (old, new) in totals.items():
+        old, new = old / len(resumes), new / len(resumes)
+        saved = 1 - new / old if old else 0
+        print(f"{node:<32}{old:>8.0f}{new:>8.0f}{saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Local similarity scorer vs the LLM-only semantic match: precision and latency.
+
+    python -m benchmarks.skill_similarity            # local scorer only
+    python -m benchmarks.skill_similarity --live     # also ask the model
+
+LABELLED holds JD skills that survived exact matching against RESUME_SKILLS,
+each marked with whether the resume really covers it. The local scorer is
+timed over --repeat applications; precision is reported separately for the
+skills it matched and the skills it rejected, next to the share it leaves to
+the LLM. With --live the same skills go through the current LLM-only path.
+"""
+
+import argparse
+import asyncio
+import time
+from agent.llm import model
+from agent.prompts import SKILL_MATCH_SYSTEM_PROMPT, skill_match_user_prompt
+from agent.skill_similarity import classify
+from config import settings
+from schemas import SemanticMatchResponseSchema
+
+RESUME_SKILLS = {
+    "python", "typescript", "sql", "fastapi", "react", "pytorch", "docker",
+    "kubernetes", "aws", "postgres", "mysql", "javascript", "redis", "git",
+}
+
+LABELLED = {
+    "python 3": True,
+    "typescript 5": True,
+    "react.js": True,
+    "reactjs": True,
+    "postgresql": True,
+    "postgresql 15": True,
+    "docker compose": True,
+    "pytorch lightning": True,
+    "aws lambda": True,
+    "sql server": True,
+    "redis cache": True,
+    "git version control": True,
+    "relational databases": True,
+    "amazon s3": True,
+    "machine learning": True,
+    "container orchestration": True,
+    "java": False,
+    "nosql": False,
+    "react native": False,
+    "graphql": False,
+    "terraform": False,
+    "go": False,
+    "rust": False,
+    "django": False,
+    "flask": False,
+    "ci/cd": False,
+    "kafka": False,
+    "spark": False,
+    "scala": False,
+    "tableau": False,
+    "figma": False,
+    "c++": False,
+}
+
+
+def precision(skills: set[str], expected: bool) -> str:
+    if not skills:
+        return "n/a"
+    correct = sum(LABELLED[s] == expected for s in skills)
+    return f"{correct}/{len(skills)}"
+
+
+async def llm_only() -> tuple[float, set[str]]:
+    structured = model.with_structured_output(SemanticMatchResponseSchema)
+    messages = [
+        {"role": "system", "content": SKILL_MATCH_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": skill_match_user_prompt(RESUME_SKILLS, set(LABELLED), set()),
+        },
+    ]
+    started = time.perf_counter()
+    response = await structured.ainvoke(messages)
+    elapsed = time.perf_counter() - started
+    matched = {s.strip().lower() for s in response.matched_must_have} & set(LABELLED)
+    return elapsed, matched
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        f"{len(LABELLED)} leftover JD skills, {len(RESUME_SKILLS)} resume skills, "
+        f"offline accept >= {settings.SKILL_SIMILARITY_ACCEPT}, "
+        f"reject < {settings.SKILL_SIMILARITY_REJECT}\n"
+    )
+    print(
+        f"{'path':<10}{'ms / app':>10}{'matched ok':>12}"
+        f"{'rejected ok':>13}{'to LLM':>8}"
+    )
+
+    for offline in (False, True):
+        settings.SKILL_SIMILARITY_OFFLINE = offline
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            matched, rejected, ambiguous = classify(set(LABELLED), RESUME_SKILLS)
+        per_app = (time.perf_counter() - started) / args.repeat * 1000
+        name = "offline" if offline else "local"
+        print(
+            f"{name:<10}{per_app:>10.2f}{precision(matched, True):>12}"
+            f"{precision(rejected, False):>13}{len(ambiguous):>8}"
+        )
+
+    if args.live:
+        elapsed, matched = asyncio.run(llm_only())
+        rejected = set(LABELLED) - matched
+        print(
+            f"{'llm':<10}{elapsed * 1000:>10.0f}{precision(matched, True):>12}"
+            f"{precision(rejected, False):>13}{len(LABELLED):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
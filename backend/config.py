@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Literal
 
 
 class Settings(BaseSettings):
@@ -14,10 +15,56 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
 
+    # Connections one process may hold, shared out between the async engine
+    # (routes, progress writes), the LangGraph checkpointer and the sync engine
+    # (agent helpers, job queue). Every API and worker process takes a full
+    # budget, so their sum has to fit Postgres' max_connections.
+    DB_POOL_BUDGET: int = 30
+    DB_POOL_SHARES: dict[str, float] = {"async": 0.5, "checkpointer": 0.3, "sync": 0.2}
+    # seconds to wait for a free connection before the checkout fails
+    DB_POOL_TIMEOUT: float = 10
+    # connections held this long are reported by /api/health/db as likely leaks
+    DB_POOL_LEAK_SECONDS: float = 30
+    # record where each connection was checked out (costs a stack walk each)
+    DB_POOL_TRACE_CHECKOUTS: bool = False
+
+    # Progress events: "memory" reaches clients of this process only,
+    # "postgres" fans out to every worker through LISTEN/NOTIFY
+    PROGRESS_BACKEND: Literal["memory", "postgres"] = "memory"
+    PROGRESS_NOTIFY_CHANNEL: str = "progress"
+    # node transitions and steps of a run are written at most this often
+    PROGRESS_FLUSH_SECONDS: float = 0.5
+
+    # Tailoring runs: "background" runs them as API background tasks, "queue"
+    # stores them in the jobs table for worker.py to claim
+    TAILOR_RUNNER: Literal["background", "queue"] = "background"
+    JOB_CONCURRENCY: int = 4
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_HEARTBEAT_SECONDS: int = 10
+    # a running job without a heartbeat for this long is claimed again
+    JOB_STALE_SECONDS: int = 60
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 5
+
     # Security / JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # resolved users per token; 0 looks the user up on every request
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # users allowed on the maintenance endpoints: JD cache eviction and
+    # the /api/health stats other than the plain liveness check
+    ADMIN_EMAILS: list[str] = []
+
+    # Password hashing: argon2 costs (stored hashes made with other values are
+    # upgraded at the next login) and the executor it runs on; requests past
+    # WORKERS + MAX_QUEUE get a 503
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
 
     # AWS / S3
     AWS_ACCESS_KEY_ID: str
@@ -31,5 +78,73 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
 
+    # LLM scheduler
+    LLM_MAX_IN_FLIGHT: int = 16
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 200000
+
+    # Per-call token, latency and cost records
+    LLM_USAGE_TRACKING: bool = True
+
+    # LLM response cache
+    LLM_CACHE_BACKEND: Literal["postgres", "file", "memory"] = "postgres"
+    LLM_CACHE_DIR: str = ".llm_cache"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MEMORY_MAX_ENTRIES: int = 1000
+    LLM_CACHE_MAX_ENTRIES: int = 100000
+    LLM_CACHE_NODES: list[str] = [
+        "jd_parsing_node",
+        "skill_match_node",
+        "project_selection_node",
+        "skill_selection_node",
+        "batch_experience_rewrite_node",
+        "project_rewrite_node",
+        "experience_rewrite_node",
+    ]
+
+    # Tailoring
+    EXPERIENCE_REWRITE_MODE: Literal["per_entry", "batched"] = "per_entry"
+    SPECULATIVE_PROJECT_REWRITE: bool = True
+    SPECULATION_TTL_SECONDS: int = 3600
+    # stream partial rewrites to /api/applications/{id}/stream
+    STREAM_REWRITES: bool = True
+    # partial rewrites of one item go out at most this often
+    STREAM_PARTIAL_SECONDS: float = 0.2
+
+    # Validated resumes kept per process for application detail reads
+    RESUME_SCHEMA_CACHE_SIZE: int = 1000
+
+    # Parsed job descriptions shared across users
+    JD_CACHE_ENABLED: bool = True
+    JD_CACHE_TTL_SECONDS: int = 3 * 24 * 3600
+
+    # Learned skill aliases consulted before semantic skill matching
+    SKILL_ALIASES_ENABLED: bool = True
+
+    # Local n-gram similarity: skills with the same words as a resume skill
+    # match, scores below REJECT don't, and the rest go to the LLM. OFFLINE
+    # decides those by score too, matching at or above ACCEPT
+    SKILL_SIMILARITY_ACCEPT: float = 0.7
+    SKILL_SIMILARITY_REJECT: float = 0.05
+    SKILL_SIMILARITY_OFFLINE: bool = False
+
+    # Local project pre-ranking: only the top K go to the LLM, and none do when
+    # the last pick outscores the first project left out by MARGIN
+    PROJECT_RANK_TOP_K: int = 8
+    PROJECT_RANK_MARGIN: float = 0.15
+
+    # Estimated user-prompt tokens per node; lowest-value content is trimmed first
+    PROMPT_TOKEN_BUDGETS: dict[str, int] = {
+        "project_selection_node": 2000,
+        "skill_selection_node": 1000,
+        "project_rewrite_node": 1000,
+        "experience_rewrite_node": 1000,
+        "batch_experience_rewrite_node": 3000,
+    }
+
+    # Feedback loops keep only this many earlier notes, each cut to this length
+    MESSAGE_HISTORY_FEEDBACK_ITEMS: int = 5
+    MESSAGE_HISTORY_FEEDBACK_CHARS: int = 300
+
 
 settings = Settings()  # type: ignore
@@ -1,5 +1,10 @@
+from contextlib import asynccontextmanager
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from utils.pool_monitor import PoolMonitor, current_owner
 from config import settings
 
 DATABASE_URL = (
@@ -11,10 +16,63 @@ DATABASE_URL = (
     "?sslmode=require"
 )
 
-engine = create_engine(DATABASE_URL, echo=False)
+
+def pool_sizes() -> dict[str, int]:
+    """DB_POOL_BUDGET split by DB_POOL_SHARES. The pools never overflow, so a
+    process holds at most the budget, plus the progress LISTEN connection
+    which is taken out of it up front."""
+    budget = settings.DB_POOL_BUDGET
+    if settings.PROGRESS_BACKEND == "postgres":
+        budget -= 1
+    total = sum(settings.DB_POOL_SHARES.values())
+    return {
+        name: max(1, int(budget * share / total))
+        for name, share in settings.DB_POOL_SHARES.items()
+    }
+
+
+POOL_SIZES = pool_sizes()
+
+monitors = {
+    name: PoolMonitor(
+        name,
+        POOL_SIZES[name],
+        settings.DB_POOL_LEAK_SECONDS,
+        settings.DB_POOL_TRACE_CHECKOUTS,
+    )
+    for name in ("sync", "async")
+}
+
+# create_all, the agent's to_thread helpers and the worker's queue calls
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    poolclass=monitors["sync"].pool_class(QueuePool),
+    pool_size=POOL_SIZES["sync"],
+    max_overflow=0,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
+monitors["sync"].attach(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The routes, the auth dependency and the progress writer use the async engine
+# (psycopg 3) so a slow query never stalls the event loop.
+async_engine = create_async_engine(
+    DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1),
+    echo=False,
+    poolclass=monitors["async"].pool_class(AsyncAdaptedQueuePool),
+    pool_size=POOL_SIZES["async"],
+    max_overflow=0,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
+monitors["async"].attach(async_engine.sync_engine)
+
+# attributes stay loaded after commit; lazy loads can't run on an async session
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -23,9 +81,22 @@ def init_db():
     print("Tables created")
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_async_db(request: Request):
+    # the request's context ends with it, so the owner is never reset
+    current_owner.set(f"{request.method} {request.url.path}")
+    async with AsyncSessionLocal() as db:
         yield db
+
+
+@asynccontextmanager
+async def session_scope(owner: str):
+    """A session for work outside a request: background tasks, the worker,
+    SSE snapshots. It is closed (and rolled back if uncommitted) on exit, and
+    its connections show up as ``owner`` in the pool stats. Keep the block
+    short; anything slow belongs outside it."""
+    token = current_owner.set(owner)
+    try:
+        async with AsyncSessionLocal() as db:
+            yield db
     finally:
-        db.close()
+        current_owner.reset(token)
@@ -1,6 +1,18 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Text, Enum
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    JSON,
+    ForeignKey,
+    Text,
+    Enum,
+    Integer,
+    Boolean,
+    Float,
+    Index,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from db import Base
@@ -24,6 +36,13 @@ class ResumeStatus(enum.Enum):
     SUCCESS = "success"
 
 
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -86,6 +105,14 @@ class Application(Base):
         back_populates="application",
         order_by="ApplicationStep.created_at",
     )
+    usage = relationship(
+        "LLMUsage", back_populates="application", passive_deletes=True
+    )
+
+    # the dashboard listing seeks by (created_at, id) within one user
+    __table_args__ = (
+        Index("ix_applications_user_created", "user_id", "created_at", "id"),
+    )
 
 
 class ApplicationStep(Base):
@@ -99,3 +126,95 @@ class ApplicationStep(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     application = relationship("Application", back_populates="steps")
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key = Column(String, primary_key=True)
+    model = Column(String, nullable=False)
+    schema = Column(String, nullable=False)
+    response = Column(JSON, nullable=False)
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class JobPostingCache(Base):
+    __tablename__ = "jd_cache"
+
+    content_hash = Column(String, primary_key=True)
+    job_id = Column(String, nullable=True, index=True)
+    job_description = Column(Text, nullable=False)
+    company_name = Column(String, nullable=True)
+    title = Column(String, nullable=True)
+    jd_json = Column(JSON, nullable=False)
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class SkillAlias(Base):
+    __tablename__ = "skill_aliases"
+
+    # does resume_skill cover jd_skill? both stored stripped and lowercased
+    jd_skill = Column(String, primary_key=True)
+    resume_skill = Column(String, primary_key=True)
+    matches = Column(Boolean, nullable=False)
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class LLMUsage(Base):
+    __tablename__ = "llm_usage"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("applications.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    node = Column(String, nullable=False)
+    iteration = Column(Integer, default=1, nullable=False)
+    model = Column(String, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    cached_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Integer, default=0, nullable=False)
+    cost_usd = Column(Float, default=0.0, nullable=False)
+    cache_hit = Column(Boolean, default=False, nullable=False)
+    created_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), index=True
+    )
+
+    application = relationship("Application", back_populates="usage")
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("applications.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # "start" or "resume"; payload is the JSON the worker rebuilds the graph input from
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    run_after = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    locked_by = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
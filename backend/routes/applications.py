@@ -1,25 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
-from security.jwt import get_current_active_user
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    BackgroundTasks,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from security.jwt import get_current_active_user, get_current_admin_user
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from models import User, ApplicationStatus, ApplicationStep
-from db import get_db
+from db import get_async_db, session_scope
 from utils.fetch import fetch_job_description
+from utils import jd_cache, progress, conditional, jobs, pagination, resume_cache
+from utils.pool_monitor import current_owner
+from config import settings
 from agent.graph import tailor_agent
 from langchain_core.runnables import RunnableConfig
 from schemas import (
     ContinueRequest,
     ResumeSchema,
+    JDResponseSchema,
     ApplicationResponse,
     ApplicationsResponse,
     ApplicationCreateRequest,
     ApplicationStatusUpdate,
+    UsageReport,
 )
 from langgraph.types import Command
-from models import Resume, Application
+from models import Resume, Application, LLMUsage
+from agent import usage, stream
 from utils.makepdf import make_pdf
 from utils.s3 import upload_to_s3
 from utils.serialize import serialize_output, SetEncoder
+from utils.progress_writer import ProgressWriter
 from uuid import UUID
+import asyncio
 import json
 
 route = APIRouter(prefix="/api/applications", tags=["applications"])
@@ -58,48 +77,56 @@ CAROUSEL_CONFIG = {
 }
 
 
-async def graph_stream(input, config: dict, application_id=None, db=None):
-    async for event in tailor_agent.astream_events(input, config=config, version="v2"):
-        event_name = event["event"]
-        name = event["name"]
-        node = event.get("metadata", {}).get("langgraph_node", "")
-
-        # print(node)
-
-        if event_name == "on_chain_start" and name == node and node in NODE_LABELS:
-            if db and application_id:
-                app = (
-                    db.query(Application)
-                    .filter(Application.id == application_id)
-                    .first()
-                )
-                app.current_node = node
-                db.commit()
-
-        elif (
-            event_name == "on_chain_end"
-            and name == node
-            and node in STRUCTURED_OUTPUT_NODES
+async def graph_stream(
+    input, config: dict, application_id=None, cache_jd: bool = False
+):
+    # the agent's database helpers run on threads that inherit this owner
+    current_owner.set(f"graph_stream {application_id}")
+    writer = ProgressWriter(application_id) if application_id else None
+    try:
+        async for event in tailor_agent.astream_events(
+            input, config=config, version="v2"
         ):
-            output = serialize_output(event["data"].get("output", {}))
-
-            if db and application_id:
-                step = ApplicationStep(
-                    application_id=application_id,
-                    node=node,
-                    label=NODE_LABELS.get(node, node),
-                    data=output,
-                )
-                db.add(step)
-                app = (
-                    db.query(Application)
-                    .filter(Application.id == application_id)
-                    .first()
-                )
-                app.current_node = node
-                db.commit()
-
-    final_state = tailor_agent.get_state(config)
+            event_name = event["event"]
+            name = event["name"]
+            node = event.get("metadata", {}).get("langgraph_node", "")
+
+            if (
+                event_name == "on_chain_start"
+                and name == node
+                and node in NODE_LABELS
+                and writer
+            ):
+                await writer.node(node)
+
+            elif (
+                event_name == "on_chain_end"
+                and name == node
+                and node in STRUCTURED_OUTPUT_NODES
+                and writer
+            ):
+                output = serialize_output(event["data"].get("output", {}))
+                await writer.step(node, NODE_LABELS.get(node, node), output)
+
+                if node == "jd_parsing_node" and cache_jd:
+                    try:
+                        async with session_scope("jd_cache") as db:
+                            app = await db.get(Application, application_id)
+                            await jd_cache.store(
+                                db,
+                                app.job_id,
+                                app.job_description,
+                                app.company_name,
+                                app.title,
+                                output["jd_json"],
+                            )
+                    except Exception as e:
+                        print(f"JD cache write failed: {e}")
+    finally:
+        if writer:
+            await writer.flush()
+
+    final_state = await tailor_agent.aget_state(config)
 
     rewritten = final_state.values.get("rewritten_projects", [])
     interrupts = final_state.interrupts or []
@@ -117,8 +144,24 @@ async def graph_stream(input, config: dict, application_id=None, db=None):
         print(f"    id={i.id}  project='{title}'")
     print(f"{'='*60}\n")
 
-    if db and application_id:
-        app = db.query(Application).filter(Application.id == application_id).first()
+    if not application_id:
+        return
+
+    pdf_key = latex = None
+    if not final_state.next:
+        # LaTeX and the upload are slow; no connection is held while they run
+        async with session_scope("graph_stream") as db:
+            user_id = await db.scalar(
+                select(Application.user_id).where(Application.id == application_id)
+            )
+        pdf_bytes, latex = await asyncio.to_thread(
+            make_pdf, final_state.values["tailored_resume_json"]
+        )
+        pdf_key = f"resumes/{user_id}/{application_id}.pdf"
+        await asyncio.to_thread(upload_to_s3, pdf_bytes, pdf_key)
+
+    async with session_scope("graph_stream") as db:
+        app = await db.get(Application, application_id)
 
         if final_state.next:
             app.current_node = final_state.next[0]
@@ -136,57 +179,243 @@ async def graph_stream(input, config: dict, application_id=None, db=None):
             tailored_resume_json = final_state.values["tailored_resume_json"]
             skill_match_results = final_state.values["skill_match_results"]
 
-            pdf_bytes, latex = make_pdf(tailored_resume_json)
-            key = f"resumes/{app.user_id}/{app.id}.pdf"
-            upload_to_s3(pdf_bytes, key)
-
             app.skill_match_results = json.loads(
                 json.dumps(skill_match_results.model_dump(), cls=SetEncoder)
             )
             app.tailored_resume_json = tailored_resume_json.model_dump()
-            app.pdf_key = key
+            app.pdf_key = pdf_key
             app.latex = latex
 
-        db.commit()
+        await db.commit()
+
+    if app.status == ApplicationStatus.INTERRUPTED:
+        event = {
+            "type": "interrupt",
+            "current_node": app.current_node,
+            "interrupt_payloads": app.interrupt_payloads,
+        }
+    else:
+        # the client refetches once for the resume, PDF key and LaTeX
+        event = {"type": "complete", "current_node": None}
+    event["status"] = app.status.value
+    await progress.publish(progress.application_channel(application_id), event)
+
+
+async def get_owned_application(db: AsyncSession, application_id, user_id, *options):
+    return await db.scalar(
+        select(Application)
+        .where(Application.id == application_id, Application.user_id == user_id)
+        .options(*options)
+    )
 
 
 @route.get("/", response_model=list[ApplicationsResponse])
 async def get_applications(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    status: list[ApplicationStatus] | None = Query(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    applications = (
-        db.query(Application)
-        .filter(Application.user_id == current_user.id)
-        .order_by(Application.created_at.desc())
-        .all()
+    """The user's applications, newest first, ``limit`` at a time and
+    optionally only those in ``status``. When there are more, the
+    X-Next-Cursor header holds the ``cursor`` for the next page."""
+    query = (
+        # only the listed columns; the resume and LaTeX blobs stay in the table
+        select(
+            Application.id,
+            Application.status,
+            Application.company_name,
+            Application.title,
+            Application.created_at,
+        )
+        .where(Application.user_id == current_user.id)
+        .order_by(Application.created_at.desc(), Application.id.desc())
+        .limit(limit + 1)
     )
-    return applications
+    if status:
+        query = query.where(Application.status.in_(status))
+    if cursor:
+        try:
+            created_at, last_id = pagination.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        query = query.where(
+            tuple_(Application.created_at, Application.id) < (created_at, last_id)
+        )
+
+    rows = (await db.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = pagination.encode_cursor(
+            rows[-1].created_at, rows[-1].id
+        )
+    return [row._asdict() for row in rows]
 
 
 @route.get("/{application_id}", response_model=ApplicationResponse)
 async def get_application(
     application_id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    application = (
-        db.query(Application)
-        .filter(
-            Application.id == application_id,
-            Application.user_id == current_user.id,
+    # validators from a handful of columns, so an unchanged application
+    # costs one small query and no serialization
+    steps = select(ApplicationStep).where(
+        ApplicationStep.application_id == Application.id
+    )
+    step_count = steps.with_only_columns(func.count()).scalar_subquery()
+    latest_step = steps.with_only_columns(
+        func.max(ApplicationStep.created_at)
+    ).scalar_subquery()
+    resume_updated = (
+        select(Resume.updated_at)
+        .where(Resume.user_id == current_user.id)
+        .scalar_subquery()
+    )
+    current = (
+        await db.execute(
+            select(Application.updated_at, step_count, latest_step, resume_updated).where(
+                Application.id == application_id,
+                Application.user_id == current_user.id,
+            )
         )
-        .first()
+    ).first()
+    if not current:
+        raise HTTPException(status_code=404, detail="Application not found.")
+
+    etag, last_modified = conditional.validators(application_id, *current)
+    if conditional.is_fresh(request, etag, last_modified):
+        return conditional.not_modified(etag, last_modified)
+    conditional.set_validators(response, etag, last_modified)
+
+    result = await load_application_detail(
+        db, application_id, current_user.id, resume_updated_at=current[-1]
     )
+    if not result:
+        raise HTTPException(status_code=404, detail="Application not found.")
+    return result
+
+
+async def load_application_detail(
+    db: AsyncSession, application_id, user_id, resume_updated_at=None
+) -> ApplicationResponse | None:
+    """The application, its steps and the user's resume in one query.
+
+    The resume is joined in only when resume_cache has nothing for
+    ``resume_updated_at``; otherwise the validated copy is reused and the
+    JSON is not read at all.
+    """
+    resume = resume_cache.get(user_id, resume_updated_at)
+    query = (
+        select(Application)
+        .where(Application.id == application_id, Application.user_id == user_id)
+        .options(joinedload(Application.steps))
+    )
+    if resume is None:
+        query = query.add_columns(Resume).outerjoin(
+            Resume, Resume.user_id == Application.user_id
+        )
+
+    row = (await db.execute(query)).unique().first()
+    if not row:
+        return None
+
+    if resume is None and row[1] is not None:
+        # keyed by what was read, in case the resume changed since the caller looked
+        resume = resume_cache.put(user_id, row[1].updated_at, row[1].resume_json)
+
+    result = ApplicationResponse.model_validate(row[0])
+    result.resume_json = resume
+    return result
+
+
+@route.get("/{application_id}/usage", response_model=UsageReport)
+async def get_application_usage(
+    application_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    application = await get_owned_application(db, application_id, current_user.id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found.")
 
-    resume = db.query(Resume).filter(Resume.user_id == current_user.id).first()
+    return await db.run_sync(
+        usage.summarize, LLMUsage.application_id == application_id
+    )
+
+
+@route.get("/{application_id}/stream")
+async def stream_application(
+    application_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Server-sent events with the rewrites in progress, bullet by bullet."""
+    application = await get_owned_application(db, application_id, current_user.id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found.")
+    # the dependency only closes the session once the stream ends; give the
+    # connection back now instead of holding it for as long as the tab is open
+    await db.close()
+
+    async def events():
+        async with progress.subscribe(stream.rewrite_channel(application_id)) as queue:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: rewrite\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    response = ApplicationResponse.model_validate(application)
-    response.resume_json = ResumeSchema(**resume.resume_json) if resume else None
 
-    return response
+@route.get("/{application_id}/events")
+async def application_events(
+    application_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Server-sent progress events: the current node, new steps, interrupts
+    and completion. The first event is a snapshot of the status and step
+    count, so a client can tell whether it missed anything before connecting."""
+    application = await get_owned_application(db, application_id, current_user.id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found.")
+    # the dependency only closes the session once the stream ends
+    await db.close()
+
+    async def snapshot():
+        step_count = (
+            select(func.count())
+            .where(ApplicationStep.application_id == Application.id)
+            .scalar_subquery()
+        )
+        async with session_scope("application events") as session:
+            row = (
+                await session.execute(
+                    select(Application.status, Application.current_node, step_count)
+                    .where(Application.id == application_id)
+                )
+            ).first()
+        if not row:
+            return {"status": None, "current_node": None, "steps": 0}
+        return {"status": row[0].value, "current_node": row[1], "steps": row[2]}
+
+    return StreamingResponse(
+        progress.sse_events(progress.application_channel(application_id), snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @route.post("/")
@@ -194,24 +423,40 @@ async def create_application(
     payload: ApplicationCreateRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    db_resume = db.query(Resume).filter(Resume.user_id == current_user.id).first()
+    db_resume = await db.scalar(select(Resume).where(Resume.user_id == current_user.id))
     if not db_resume:
         raise HTTPException(status_code=404, detail="No resume found.")
 
     resume_json = ResumeSchema(**db_resume.resume_json)
 
+    use_cache = settings.JD_CACHE_ENABLED and not payload.force_refresh
+    cached = None
+
     if payload.job_id:
-        try:
-            job_description, company_name, title = fetch_job_description(payload.job_id)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=str(e))
+        if use_cache:
+            cached = await jd_cache.lookup_by_job_id(db, payload.job_id)
+        if cached:
+            job_description = cached.job_description
+            company_name = cached.company_name
+            title = cached.title
+        else:
+            try:
+                job_description, company_name, title = await asyncio.to_thread(
+                    fetch_job_description, payload.job_id
+                )
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
     else:
         job_description = payload.job_description
         company_name = payload.company_name
         title = payload.title
 
+    # the same posting may have been pasted or fetched under another id
+    if use_cache and not cached:
+        cached = await jd_cache.lookup_by_hash(db, job_description)
+
     application = Application(
         user_id=current_user.id,
         job_id=payload.job_id,
@@ -220,30 +465,63 @@ async def create_application(
         title=title,
     )
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    # the id is needed for the job; the row and the job are committed together
+    await db.flush()
 
     config: RunnableConfig = {"configurable": {"thread_id": str(application.id)}}
-    background_tasks.add_task(
-        graph_stream,
-        {"raw_html": job_description, "resume_json": resume_json},
-        config,
-        application_id=application.id,
-        db=next(get_db()),
-    )
+    graph_input = {"raw_html": job_description, "resume_json": resume_json}
+    if cached:
+        graph_input["jd_json"] = JDResponseSchema(**cached.jd_json)
+
+    cache_jd = settings.JD_CACHE_ENABLED and not cached
+    if settings.TAILOR_RUNNER == "queue":
+        jobs.enqueue(
+            db,
+            application.id,
+            "start",
+            {
+                "raw_html": job_description,
+                "resume_json": db_resume.resume_json,
+                "jd_json": cached.jd_json if cached else None,
+                "cache_jd": cache_jd,
+            },
+        )
+    else:
+        background_tasks.add_task(
+            graph_stream,
+            graph_input,
+            config,
+            application_id=application.id,
+            cache_jd=cache_jd,
+        )
 
+    # a crash before this leaves neither an application nor a job behind
+    await db.commit()
     return {"application_id": application.id}
 
 
+@route.delete("/jd-cache/{job_id}")
+async def invalidate_job_description(
+    job_id: str,
+    # the cache is shared by every user, so only admins may evict from it
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    removed = await jd_cache.invalidate(db, job_id)
+    if not removed:
+        raise HTTPException(status_code=404, detail="Job description not cached.")
+    return Response(status_code=204)
+
+
 @route.post("/{application_id}/continue")
 async def continue_application(
     feedback: ContinueRequest,
     background_tasks: BackgroundTasks,
     application_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    application = db.query(Application).filter(Application.id == application_id).first()
+    application = await get_owned_application(db, application_id, current_user.id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found.")
 
@@ -264,7 +542,7 @@ async def continue_application(
     if node_name and all_approved:
         carousel = CAROUSEL_CONFIG.get(node_name)
         if carousel:
-            current_state = tailor_agent.get_state(config)
+            current_state = await tailor_agent.aget_state(config)
             prev_items = current_state.values.get(carousel["state_key"], [])
             this_round = [
                 payloads_by_id[r.interrupt_id][carousel["payload_key"]]
@@ -295,19 +573,26 @@ async def continue_application(
                         data=step_data,
                     ))
 
-    db.commit()
-
     resume_map = {
         r.interrupt_id: r.model_dump(exclude={"interrupt_id"})
         for r in feedback.responses
     }
 
-    background_tasks.add_task(
-        graph_stream,
-        Command(resume=resume_map),
-        config,
-        application_id=application.id,
-        db=next(get_db()),
+    if settings.TAILOR_RUNNER == "queue":
+        # committed with the status change, so a review is never lost
+        jobs.enqueue(db, application.id, "resume", {"resume_map": resume_map})
+    else:
+        background_tasks.add_task(
+            graph_stream,
+            Command(resume=resume_map),
+            config,
+            application_id=application.id,
+        )
+
+    await db.commit()
+    await progress.publish(
+        progress.application_channel(application_id),
+        {"type": "status", "status": application.status.value, "current_node": None},
     )
 
     return {"status": "resuming"}
@@ -318,21 +603,18 @@ async def update_application_status(
     application_id: UUID,
     payload: ApplicationStatusUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    application = (
-        db.query(Application)
-        .filter(
-            Application.id == application_id,
-            Application.user_id == current_user.id,
-        )
-        .first()
-    )
+    application = await get_owned_application(db, application_id, current_user.id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found.")
 
     application.status = payload.status
-    db.commit()
+    await db.commit()
+    await progress.publish(
+        progress.application_channel(application_id),
+        {"type": "status", "status": application.status.value},
+    )
     return {"status": application.status}
 
 
@@ -340,19 +622,12 @@ async def update_application_status(
 async def delete_application(
     application_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    application = (
-        db.query(Application)
-        .filter(
-            Application.id == application_id,
-            Application.user_id == current_user.id,
-        )
-        .first()
-    )
+    application = await get_owned_application(db, application_id, current_user.id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found.")
 
-    db.delete(application)
-    db.commit()
+    await db.delete(application)
+    await db.commit()
     return Response(status_code=204)
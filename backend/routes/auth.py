@@ -1,35 +1,43 @@
 from fastapi.security import OAuth2PasswordRequestForm
-from security.password import password_hash
+from security.password import verify_password
 from fastapi import Depends, APIRouter, HTTPException, status
 from schemas import JWTToken
-from db import get_db
+from db import get_async_db
 from models import User
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from security.jwt import create_access_token
 
 route = APIRouter(prefix="/api/login", tags=["login"])
 
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = db.query(User).filter(User.email == username).first()
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await db.scalar(select(User).where(User.email == username))
 
     if not user:
         return None
 
-    if not password_hash.verify(password, user.password_hash):  # type: ignore
+    verified, updated_hash = await verify_password(password, user.password_hash)  # type: ignore
+    if not verified:
         return None
 
+    if updated_hash:
+        # hashed with older argon2 costs; store it with the current ones
+        user.password_hash = updated_hash
+        await db.commit()
+
     return user
 
 
 @route.post("/", response_model=JWTToken)
-def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
     username = form_data.username
     password = form_data.password
 
-    user = authenticate_user(db, username, password)
+    user = await authenticate_user(db, username, password)
 
     if not user:
         raise HTTPException(
@@ -1,4 +1,13 @@
-from fastapi import APIRouter
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from agent.llm import scheduler, cache
+from agent import skill_aliases, usage, checkpointer
+from db import get_async_db, monitors
+from models import LLMUsage, User
+from security.jwt import get_current_admin_user
+from schemas import UsageReport
+from config import settings
 
 route = APIRouter(prefix="/api/health", tags=["health"])
 
@@ -6,3 +15,38 @@ route = APIRouter(prefix="/api/health", tags=["health"])
 @route.get("/")
 def health_check():
     return {"status": "healthy"}
+
+
+@route.get("/llm")
+def llm_stats(current_user: User = Depends(get_current_admin_user)):
+    return {
+        "scheduler": scheduler.stats(),
+        "cache": cache.stats(),
+        "skill_aliases": skill_aliases.stats(),
+    }
+
+
+@route.get("/db")
+def db_stats(current_user: User = Depends(get_current_admin_user)):
+    """Connection pools of this process: checkout waits, saturation and the
+    connections held past DB_POOL_LEAK_SECONDS, with their owner (and stack,
+    with DB_POOL_TRACE_CHECKOUTS), hence admins only."""
+    return {
+        "budget": settings.DB_POOL_BUDGET,
+        "pools": {
+            **{name: monitor.stats() for name, monitor in monitors.items()},
+            "checkpointer": checkpointer.stats(),
+        },
+    }
+
+
+@route.get("/llm/usage", response_model=UsageReport)
+async def llm_usage(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    # totals span every user's applications
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Model usage of every application over the last ``hours``, per node."""
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return await db.run_sync(usage.summarize, LLMUsage.created_at >= since)
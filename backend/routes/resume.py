@@ -6,12 +6,16 @@ from fastapi import (
     HTTPException,
     BackgroundTasks,
     Request,
+    Response,
 )
+from fastapi.responses import StreamingResponse
 from security.jwt import get_current_active_user
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import User
-from db import get_db
+from db import get_async_db, session_scope
 from utils.parse import parse_resume
+from utils import progress, conditional
 from uuid import UUID
 from schemas import ResumeResponse, ResumeSchema
 from models import Resume, ResumeStatus
@@ -23,10 +27,25 @@ route = APIRouter(prefix="/api/resume", tags=["resume"])
 
 @route.get("/", response_model=Optional[ResumeResponse])
 async def get_resume(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    db_resume = db.query(Resume).filter(Resume.user_id == current_user.id).first()
+    current = (
+        await db.execute(
+            select(Resume.id, Resume.updated_at, Resume.status).where(
+                Resume.user_id == current_user.id
+            )
+        )
+    ).first()
+    if current:
+        etag, last_modified = conditional.validators(*current)
+        if conditional.is_fresh(request, etag, last_modified):
+            return conditional.not_modified(etag, last_modified)
+        conditional.set_validators(response, etag, last_modified)
+
+    db_resume = await db.scalar(select(Resume).where(Resume.user_id == current_user.id))
     if not db_resume:
         return None
     return db_resume
@@ -37,60 +56,93 @@ async def parse(
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     resume: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     db_resume = Resume(user_id=current_user.id, resume_json={})
     db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
+    await db.commit()
 
-    background_tasks.add_task(process_resume, db_resume.id, resume, db=next(get_db()))
+    background_tasks.add_task(process_resume, db_resume.id, resume)
 
     return {"resume_id": db_resume.id}
 
 
-async def process_resume(resume_id: UUID, resume: UploadFile, db):
-    db_resume = db.query(Resume).filter(Resume.id == resume_id).first()
+async def process_resume(resume_id: UUID, resume: UploadFile):
+    # parsing takes a while; no connection is held during it
+    async with session_scope("process_resume") as db:
+        user_id = await db.scalar(select(Resume.user_id).where(Resume.id == resume_id))
 
     try:
         file_bytes = await resume.read()
         result = await parse_resume(file_bytes, resume.filename)
-
-        db_resume.status = ResumeStatus.SUCCESS
-        db_resume.resume_json = result
-        db.commit()
-
+        values = {"status": ResumeStatus.SUCCESS, "resume_json": result}
     except Exception as e:
         print(f"Parse error: {e}")
-        db_resume.status = ResumeStatus.ERROR
-        db.commit()
+        values = {"status": ResumeStatus.ERROR}
+
+    async with session_scope("process_resume") as db:
+        await db.execute(update(Resume).where(Resume.id == resume_id).values(**values))
+        await db.commit()
+    status = values["status"]
+
+    await progress.publish(
+        progress.resume_channel(user_id),
+        {"type": "status", "resume_id": str(resume_id), "status": status.value},
+    )
+
+
+@route.get("/events")
+async def resume_events(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Server-sent events carrying the parse status of the user's resume; the
+    first one is the current status."""
+    user_id = current_user.id
+    # the same session get_current_user looked the user up on; the dependency
+    # only closes it once the stream ends, so release its connection now
+    await db.close()
+
+    async def snapshot():
+        async with session_scope("resume events") as session:
+            db_resume = await session.scalar(select(Resume).where(Resume.user_id == user_id))
+            return {
+                "resume_id": str(db_resume.id) if db_resume else None,
+                "status": db_resume.status.value if db_resume else None,
+            }
+
+    return StreamingResponse(
+        progress.sse_events(progress.resume_channel(user_id), snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @route.put("/save", response_model=ResumeResponse)
 async def save_resume(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     body = await request.json()
     updated_resume = ResumeSchema(**body)
-    db_resume = db.query(Resume).filter(Resume.user_id == current_user.id).first()
+    db_resume = await db.scalar(select(Resume).where(Resume.user_id == current_user.id))
     db_resume.resume_json = updated_resume.model_dump()
-    db.commit()
-    db.refresh(db_resume)
+    await db.commit()
+    await db.refresh(db_resume)
     return db_resume
 
 
 @route.delete("/")
 async def delete_resume(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
 
-    db_resume = db.query(Resume).filter(Resume.user_id == current_user.id).first()
+    db_resume = await db.scalar(select(Resume).where(Resume.user_id == current_user.id))
     if not db_resume:
         return HTTPException(404, detail="Resume not found")
 
-    db.delete(db_resume)
-    db.commit()
+    await db.delete(db_resume)
+    await db.commit()
     return
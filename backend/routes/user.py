@@ -1,22 +1,25 @@
 from fastapi import Depends, APIRouter, HTTPException, status
 from schemas import UserCreateRequest, UserResponse
-from db import get_db
+from db import get_async_db
 from models import User
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from security.jwt import get_current_active_user
-from security.password import password_hash
+from security.password import hash_password
 
 route = APIRouter(prefix="/api/users", tags=["users"])
 
 
 @route.get("/me", response_model=UserResponse)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
 @route.post("/", response_model=UserResponse)
-def create_user(user: UserCreateRequest, db: Session = Depends(get_db)):
-    existingEmail = db.query(User).filter(User.email == user.email).first()
+async def create_user(
+    user: UserCreateRequest, db: AsyncSession = Depends(get_async_db)
+):
+    existingEmail = await db.scalar(select(User).where(User.email == user.email))
 
     if existingEmail:
         raise HTTPException(
@@ -24,7 +27,7 @@ def create_user(user: UserCreateRequest, db: Session = Depends(get_db)):
             detail={"email": "Email already exists"},
         )
 
-    hashed_password = password_hash.hash(user.password)
+    hashed_password = await hash_password(user.password)
 
     db_user = User(
         name=user.name,
@@ -32,6 +35,5 @@ def create_user(user: UserCreateRequest, db: Session = Depends(get_db)):
         email=user.email,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
     return db_user
@@ -42,6 +42,8 @@ class ApplicationCreateRequest(BaseModel):
     job_description: Optional[str] = None
     company_name: Optional[str] = None
     title: Optional[str] = None
+    # skip the shared parse cache and fetch/parse the posting again
+    force_refresh: bool = False
 
     @model_validator(mode="after")
     def validate_input(self):
@@ -95,6 +97,22 @@ class ApplicationStepResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class UsageSummary(BaseModel):
+    calls: int
+    cache_hits: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    latency_ms: int
+    avg_latency_ms: int
+    cost_usd: float
+
+
+class UsageReport(BaseModel):
+    total: UsageSummary
+    by_node: dict[str, UsageSummary]
+
+
 class Experience(BaseModel):
     company: str
     role: str
@@ -154,6 +172,11 @@ class JDResponseSchema(BaseModel):
     keywords: list[str] = Field(description="List of keywords")
 
 
+class SkillPair(BaseModel):
+    jd_skill: str = Field(description="The JD skill that is covered")
+    resume_skill: str = Field(description="The resume skill that covers it")
+
+
 class SemanticMatchResponseSchema(BaseModel):
     matched_must_have: list[str] = Field(
         description="JD must-have skills semantically covered by resume"
@@ -161,6 +184,10 @@ class SemanticMatchResponseSchema(BaseModel):
     matched_nice_to_have: list[str] = Field(
         description="JD nice-to-have skills semantically covered by resume"
     )
+    matched_pairs: list[SkillPair] = Field(
+        default=[],
+        description="For every matched JD skill, the resume skill that covers it",
+    )
 
 
 class SkillMatchResultSchema(BaseModel):
@@ -191,6 +218,12 @@ class ExperienceRewriteResponse(BaseModel):
     rewritten_experience: Experience
 
 
+class BatchExperienceRewriteResponse(BaseModel):
+    rewritten_experiences: list[ExperienceRewriteResponse] = Field(
+        description="One rewritten entry per input experience, in the same order"
+    )
+
+
 class HumanReviewResponse(BaseModel):
     interrupt_id: Optional[str] = None
     approved: bool
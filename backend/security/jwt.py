@@ -1,10 +1,13 @@
 from fastapi.security import OAuth2PasswordBearer
+import uuid
 from datetime import datetime, timedelta, timezone
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
-from db import get_db
+from db import get_async_db
 from models import User
-from sqlalchemy.orm import Session
+from security import principal_cache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from config import settings
 
@@ -16,7 +19,8 @@ def create_access_token(data: dict):
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode.update({"exp": expire})
+    # jti tells tokens of the same user apart in the principal cache
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -24,7 +28,7 @@ def create_access_token(data: dict):
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,9 +51,16 @@ async def get_current_user(
     except InvalidTokenError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == username).first()
+    token_id = payload.get("jti")
+    user = principal_cache.get(username, token_id)
+    if user is not None:
+        return user
+
+    user = await db.scalar(select(User).where(User.email == username))
     if user is None:
         raise credentials_exception
+    db.expunge(user)
+    principal_cache.put(username, token_id, payload["exp"], user)
     return user
 
 
@@ -57,3 +68,10 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     # if current_user.disabled:
     #     raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
+    admins = {email.strip().lower() for email in settings.ADMIN_EMAILS}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only.")
+    return current_user
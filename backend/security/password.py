@@ -1,3 +1,61 @@
+"""Argon2 hashing on a small executor of its own.
+
+Hashing is slow on purpose and holds a core for its whole run. On the shared
+default threadpool a burst of logins queued up in front of every other
+to_thread call. Here at most PASSWORD_HASH_WORKERS hashes run at a time and
+PASSWORD_HASH_MAX_QUEUE more may wait; beyond that the request is turned
+away with a 503 and Retry-After instead of piling up.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from config import settings
+
+password_hash = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST,
+            parallelism=settings.ARGON2_PARALLELISM,
+        ),
+    )
+)
+
+# argon2-cffi releases the GIL while hashing, so threads run in parallel
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2"
+)
+# released when the hash finishes, even if the request gave up waiting
+_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins at once. Try again in a moment.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(password_hash.hash, password)
+
 
-password_hash = PasswordHash.recommended()
+async def verify_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """Whether ``password`` matches, and a new hash when ``hashed`` was made
+    with other cost parameters than the configured ones."""
+    return await _run(password_hash.verify_and_update, password, hashed)
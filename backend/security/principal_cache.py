@@ -0,0 +1,58 @@
+"""Users resolved by get_current_user, kept for a short while per token.
+
+Every authenticated request, polls included, used to look the user up by
+email. Entries are keyed by the token's subject and id (jti) and live for
+PRINCIPAL_CACHE_TTL_SECONDS, never past the token's own expiry. Any flush
+that updates or deletes a User drops that user's entries in this process;
+other processes catch up within the TTL.
+
+Cached users are detached from any session and shared between requests:
+read their columns, don't modify them or add them to a session.
+"""
+
+import time
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from models import User
+from config import settings
+
+_entries: OrderedDict[tuple[str, str | None], tuple[float, User]] = OrderedDict()
+
+
+def get(subject: str, token_id: str | None) -> User | None:
+    key = (subject, token_id)
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if expires_at < time.monotonic():
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return user
+
+
+def put(subject: str, token_id: str | None, token_expires_at: float, user: User):
+    """``token_expires_at`` is the token's ``exp`` claim (epoch seconds)."""
+    ttl = min(settings.PRINCIPAL_CACHE_TTL_SECONDS, token_expires_at - time.time())
+    if ttl <= 0:
+        return
+    _entries[(subject, token_id)] = (time.monotonic() + ttl, user)
+    _entries.move_to_end((subject, token_id))
+    while len(_entries) > settings.PRINCIPAL_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def invalidate(subject: str):
+    """Forgets every cached token of ``subject``."""
+    for key in [k for k in _entries if k[0] == subject]:
+        del _entries[key]
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    # the subject is the email; an email change invalidates the old one too
+    history = inspect(target).attrs.email.history
+    for email in {target.email, *history.deleted}:
+        invalidate(email)
@@ -0,0 +1,59 @@
+"""ETag / Last-Modified validators for conditional GETs.
+
+Routes compute validators from a few cheap columns first and return 304 when
+the client's copy is current, before loading or serializing the full payload.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+
+# per-user payloads: the browser may keep them but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def _utc(value: datetime) -> datetime:
+    # columns are naive but hold UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def validators(*parts) -> tuple[str, datetime | None]:
+    """A weak ETag over ``parts`` and the newest datetime among them.
+
+    Weak because the same representation may go out gzipped or not.
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    stamps = [_utc(p) for p in parts if isinstance(p, datetime)]
+    return f'W/"{digest[:20]}"', max(stamps) if stamps else None
+
+
+def is_fresh(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= _utc(since)
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None):
+    response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str, last_modified: datetime | None) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,81 @@
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from bs4 import BeautifulSoup
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import JobPostingCache
+from config import settings
+
+
+def normalize_jd(job_description: str) -> str:
+    text = BeautifulSoup(job_description or "", "html.parser").get_text(" ")
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def content_hash(job_description: str) -> str:
+    return hashlib.sha256(normalize_jd(job_description).encode()).hexdigest()
+
+
+def _fresh():
+    return select(JobPostingCache).where(
+        JobPostingCache.expires_at > datetime.now(timezone.utc)
+    )
+
+
+async def lookup_by_job_id(db: AsyncSession, job_id: str) -> JobPostingCache | None:
+    entry = await db.scalar(
+        _fresh()
+        .where(JobPostingCache.job_id == job_id)
+        .order_by(JobPostingCache.created_at.desc())
+        .limit(1)
+    )
+    if entry:
+        entry.hits += 1
+        await db.commit()
+    return entry
+
+
+async def lookup_by_hash(db: AsyncSession, job_description: str) -> JobPostingCache | None:
+    entry = await db.scalar(
+        _fresh().where(JobPostingCache.content_hash == content_hash(job_description))
+    )
+    if entry:
+        entry.hits += 1
+        await db.commit()
+    return entry
+
+
+async def store(
+    db: AsyncSession,
+    job_id: str | None,
+    job_description: str,
+    company_name: str | None,
+    title: str | None,
+    jd_json: dict,
+):
+    now = datetime.now(timezone.utc)
+    values = {
+        "job_id": job_id,
+        "job_description": job_description,
+        "company_name": company_name,
+        "title": title,
+        "jd_json": jd_json,
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=settings.JD_CACHE_TTL_SECONDS),
+    }
+    await db.execute(
+        insert(JobPostingCache)
+        .values(content_hash=content_hash(job_description), hits=0, **values)
+        .on_conflict_do_update(index_elements=[JobPostingCache.content_hash], set_=values)
+    )
+    await db.commit()
+
+
+async def invalidate(db: AsyncSession, job_id: str) -> int:
+    result = await db.execute(
+        delete(JobPostingCache).where(JobPostingCache.job_id == job_id)
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,113 @@
+"""Durable queue of tailoring runs, claimed by worker.py.
+
+A job is queued by the API and claimed with SELECT ... FOR UPDATE SKIP LOCKED,
+so any number of workers can poll the same table without handing one job to
+two of them. A running job whose heartbeat is older than JOB_STALE_SECONDS
+belonged to a worker that died and is claimed again, up to JOB_MAX_ATTEMPTS.
+"""
+
+import traceback
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_, and_, update
+from sqlalchemy.orm import Session
+from models import Job, JobStatus
+from config import settings
+
+
+def enqueue(db, application_id, kind: str, payload: dict) -> Job:
+    """Adds the job to the caller's transaction (sync or async session); it is
+    visible to workers once the caller commits."""
+    job = Job(application_id=application_id, kind=kind, payload=payload)
+    db.add(job)
+    return job
+
+
+def claim(db: Session, worker_id: str) -> Job | None:
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    job = (
+        db.query(Job)
+        .filter(
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                and_(
+                    Job.status == JobStatus.RUNNING,
+                    Job.heartbeat_at < stale,
+                    Job.attempts < settings.JOB_MAX_ATTEMPTS,
+                ),
+            )
+        )
+        .order_by(Job.run_after)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if not job:
+        db.rollback()
+        return None
+
+    if job.status == JobStatus.RUNNING:
+        print(f"Job {job.id} lost its worker ({job.locked_by}), claiming again")
+    job.status = JobStatus.RUNNING
+    job.attempts += 1
+    job.locked_by = worker_id
+    job.heartbeat_at = now
+    db.commit()
+    return job
+
+
+def fail_abandoned(db: Session) -> list:
+    """Marks failed the stale running jobs that are out of attempts, which
+    claim() leaves alone, and returns their application ids."""
+    stale = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    application_ids = db.scalars(
+        update(Job)
+        .where(
+            Job.status == JobStatus.RUNNING,
+            Job.heartbeat_at < stale,
+            Job.attempts >= settings.JOB_MAX_ATTEMPTS,
+        )
+        .values(
+            status=JobStatus.FAILED,
+            locked_by=None,
+            last_error="Worker lost on the last attempt",
+        )
+        .returning(Job.application_id)
+    ).all()
+    db.commit()
+    return application_ids
+
+
+def heartbeat(db: Session, job_id, worker_id: str) -> bool:
+    """False when the job was taken over by another worker in the meantime."""
+    updated = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.locked_by == worker_id)
+        .update({Job.heartbeat_at: datetime.now(timezone.utc)})
+    )
+    db.commit()
+    return bool(updated)
+
+
+def complete(db: Session, job_id):
+    db.query(Job).filter(Job.id == job_id).update(
+        {Job.status: JobStatus.DONE, Job.locked_by: None}
+    )
+    db.commit()
+
+
+def fail(db: Session, job_id, error: BaseException) -> bool:
+    """Record the error and queue a retry with backoff; True when the job is
+    out of attempts and has been marked failed instead."""
+    db.rollback()
+    job = db.get(Job, job_id)
+    job.last_error = "".join(traceback.format_exception(error))[-4000:]
+    job.locked_by = None
+    if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+        job.status = JobStatus.FAILED
+    else:
+        job.status = JobStatus.QUEUED
+        job.run_after = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+    db.commit()
+    return job.status == JobStatus.FAILED
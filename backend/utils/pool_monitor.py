@@ -0,0 +1,126 @@
+"""Checkout accounting for the SQLAlchemy connection pools.
+
+Each engine gets a PoolMonitor that times every checkout, counts the ones that
+found the pool exhausted or timed out, and remembers who holds each connection
+right now. The holder is whatever ``current_owner`` says at checkout time:
+``db.session_scope`` and ``db.get_async_db`` set it to the background job or
+the route, and threads started with asyncio.to_thread inherit it. A connection
+held longer than DB_POOL_LEAK_SECONDS is logged when it comes back and listed
+by /api/health/db while it is still out.
+"""
+
+import contextvars
+import threading
+import time
+import traceback
+from sqlalchemy import event, exc
+
+current_owner: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "db_owner", default=None
+)
+
+
+class PoolMonitor:
+    def __init__(self, name: str, size: int, leak_seconds: float, trace: bool):
+        self.name = name
+        self.size = size
+        self.leak_seconds = leak_seconds
+        self.trace = trace
+        self._lock = threading.Lock()
+        self._held: dict[int, tuple[str, float, list | None]] = {}
+        self.checkouts = 0
+        self.exhausted = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_in_use = 0
+        self.long_held = 0
+
+    def pool_class(self, base):
+        """``base`` with its checkout timed; the engine keeps the class when it
+        recreates the pool, so the timing survives dispose()."""
+        monitor = self
+
+        class MonitoredPool(base):
+            def _do_get(self):
+                full = self.checkedout() >= self.size()
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except exc.TimeoutError:
+                    with monitor._lock:
+                        monitor.timeouts += 1
+                    raise
+                finally:
+                    monitor._waited(time.perf_counter() - started, full)
+
+        return MonitoredPool
+
+    def attach(self, engine):
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "checkin", self._checkin)
+
+    def _waited(self, seconds: float, full: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if full:
+                self.exhausted += 1
+
+    def _checkout(self, dbapi_connection, record, proxy):
+        stack = self._caller() if self.trace else None
+        with self._lock:
+            self._held[id(record)] = (
+                current_owner.get() or "unknown",
+                time.monotonic(),
+                stack,
+            )
+            self.peak_in_use = max(self.peak_in_use, len(self._held))
+
+    @staticmethod
+    def _caller():
+        # the frames that asked for the connection, not SQLAlchemy's own
+        frames = traceback.extract_stack(limit=40)[:-2]
+        return [f for f in frames if "/sqlalchemy/" not in f.filename][-8:]
+
+    def _checkin(self, dbapi_connection, record):
+        with self._lock:
+            held = self._held.pop(id(record), None)
+        if held is None:
+            return
+        owner, since, _ = held
+        seconds = time.monotonic() - since
+        if seconds >= self.leak_seconds:
+            with self._lock:
+                self.long_held += 1
+            print(f"DB pool {self.name}: {owner} held a connection for {seconds:.1f}s")
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            held = list(self._held.values())
+            checkouts = self.checkouts
+            report = {
+                "size": self.size,
+                "in_use": len(held),
+                "peak_in_use": self.peak_in_use,
+                "saturation": round(len(held) / self.size, 3) if self.size else 0.0,
+                "checkouts": checkouts,
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / checkouts * 1000, 2) if checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+                "long_held": self.long_held,
+            }
+        suspects = []
+        for owner, since, stack in held:
+            seconds = now - since
+            if seconds < self.leak_seconds:
+                continue
+            suspect = {"owner": owner, "seconds": round(seconds, 1)}
+            if stack:
+                suspect["stack"] = traceback.format_list(stack)
+            suspects.append(suspect)
+        report["suspected_leaks"] = sorted(suspects, key=lambda s: -s["seconds"])
+        return report
@@ -0,0 +1,132 @@
+"""Progress events for applications and resume parses, pushed over SSE.
+
+Channels are ``application:<id>``, ``resume:<user id>`` and, for the
+rewrites streamed by agent/stream.py, ``rewrite:<application id>``. Each
+process keeps its own subscriber queues. With PROGRESS_BACKEND=postgres, ``publish`` goes
+through NOTIFY on PROGRESS_NOTIFY_CHANNEL instead, and every process delivers
+what it hears on LISTEN to its local subscribers. That way an event published
+by one worker reaches clients connected to any other.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from psycopg import AsyncConnection
+from config import settings
+
+QUEUE_SIZE = 64
+# NOTIFY payloads are capped at 8000 bytes; bigger events go out without
+# their bulky fields and tell the client to refetch instead
+NOTIFY_MAX_BYTES = 7900
+
+_subscribers: dict[str, set[asyncio.Queue]] = {}
+_listener: asyncio.Task | None = None
+
+
+def application_channel(application_id) -> str:
+    return f"application:{application_id}"
+
+
+def resume_channel(user_id) -> str:
+    return f"resume:{user_id}"
+
+
+def _deliver(channel: str, event: dict):
+    for queue in _subscribers.get(channel, ()):
+        if queue.full():
+            # a client this far behind refetches on the next event anyway
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+def _notify_payload(channel: str, event: dict) -> str:
+    payload = json.dumps({"channel": channel, "event": event}, default=str)
+    if len(payload.encode()) <= NOTIFY_MAX_BYTES:
+        return payload
+    slim = {k: v for k, v in event.items() if k in ("type", "status", "current_node")}
+    slim["refetch"] = True
+    return json.dumps({"channel": channel, "event": slim}, default=str)
+
+
+async def publish(channel: str, event: dict):
+    if settings.PROGRESS_BACKEND != "postgres":
+        _deliver(channel, event)
+        return
+    from agent.checkpointer import pool
+
+    try:
+        async with pool.connection() as conn:
+            await conn.execute(
+                "SELECT pg_notify(%s, %s)",
+                (settings.PROGRESS_NOTIFY_CHANNEL, _notify_payload(channel, event)),
+            )
+    except Exception as e:
+        # progress is best effort; clients fall back to polling
+        print(f"Progress notify failed: {e}")
+
+
+@asynccontextmanager
+async def subscribe(channel: str):
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _subscribers.setdefault(channel, set()).add(queue)
+    try:
+        yield queue
+    finally:
+        _subscribers[channel].discard(queue)
+        if not _subscribers[channel]:
+            del _subscribers[channel]
+
+
+async def _listen():
+    from db import DATABASE_URL
+
+    while True:
+        try:
+            async with await AsyncConnection.connect(
+                DATABASE_URL, autocommit=True
+            ) as conn:
+                await conn.execute(f'LISTEN "{settings.PROGRESS_NOTIFY_CHANNEL}"')
+                async for notify in conn.notifies():
+                    message = json.loads(notify.payload)
+                    _deliver(message["channel"], message["event"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Progress listener lost its connection: {e}")
+            await asyncio.sleep(1)
+
+
+def start_listener():
+    global _listener
+    if settings.PROGRESS_BACKEND == "postgres" and _listener is None:
+        _listener = asyncio.create_task(_listen())
+
+
+async def stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
+
+
+def sse(event: dict) -> str:
+    return f"event: progress\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def sse_events(channel: str, snapshot):
+    """SSE body for one channel: ``await snapshot()`` taken after subscribing, so
+    nothing between it and the live events is lost, then every published
+    event, with a keep-alive comment every 15 seconds."""
+    async with subscribe(channel) as queue:
+        yield sse({"type": "snapshot", **(await snapshot())})
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=15)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield sse(event)
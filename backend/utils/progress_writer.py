@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import time
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import update, insert
+from db import session_scope
+from models import Application, ApplicationStep
+from schemas import ApplicationStepResponse
+from utils import progress
+from config import settings
+
+_UNSET = object()
+
+
+class ProgressWriter:
+    """Buffers one run's node transitions and steps and writes them in batches.
+
+    The first change after a quiet spell is written at once. Anything that
+    follows within ``interval`` seconds waits for a single trailing flush. A
+    flush is at most one UPDATE of the latest current_node, one multi-row
+    INSERT of the new steps and a COMMIT, on a short-lived session scope of
+    its own. Progress events go out only after the commit, so a client that
+    refetches sees what it was told.
+    """
+
+    def __init__(
+        self,
+        application_id,
+        interval: float | None = None,
+        session_factory=functools.partial(session_scope, "progress writer"),
+    ):
+        self.session_factory = session_factory
+        self.application_id = application_id
+        self.channel = progress.application_channel(application_id)
+        self.interval = (
+            settings.PROGRESS_FLUSH_SECONDS if interval is None else interval
+        )
+        self._node = _UNSET
+        self._steps: list[dict] = []
+        self._events: list[dict] = []
+        self._last_flush = float("-inf")
+        self._pending: asyncio.Task | None = None
+        # a trailing flush and the final one must not write out of order
+        self._lock = asyncio.Lock()
+
+    async def node(self, node: str):
+        self._node = node
+        self._events.append({"type": "node", "current_node": node})
+        await self._schedule()
+
+    async def step(self, node: str, label: str, data: dict):
+        step = {
+            "id": uuid.uuid4(),
+            "application_id": self.application_id,
+            "node": node,
+            "label": label,
+            "data": data,
+            "created_at": datetime.now(timezone.utc),
+        }
+        self._node = node
+        self._steps.append(step)
+        self._events.append(
+            {
+                "type": "step",
+                "current_node": node,
+                "step": ApplicationStepResponse(**step).model_dump(mode="json"),
+            }
+        )
+        await self._schedule()
+
+    async def _schedule(self):
+        wait = self._last_flush + self.interval - time.monotonic()
+        if wait <= 0:
+            await self.flush()
+        elif self._pending is None:
+            self._pending = asyncio.create_task(self._flush_later(wait))
+
+    async def _flush_later(self, wait: float):
+        await asyncio.sleep(wait)
+        # from here on flush() won't cancel this task mid-write
+        self._pending = None
+        await self.flush()
+
+    async def flush(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        self._last_flush = time.monotonic()
+
+        node, steps, events = self._node, self._steps, self._events
+        self._node, self._steps, self._events = _UNSET, [], []
+
+        # even with nothing to write, wait out a flush already in progress
+        async with self._lock:
+            if node is _UNSET and not steps:
+                return
+            async with self.session_factory() as db:
+                if node is not _UNSET:
+                    await db.execute(
+                        update(Application)
+                        .where(Application.id == self.application_id)
+                        .values(current_node=node)
+                    )
+                if steps:
+                    await db.execute(insert(ApplicationStep), steps)
+                await db.commit()
+
+            for event in events:
+                await progress.publish(self.channel, event)
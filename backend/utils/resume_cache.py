@@ -0,0 +1,44 @@
+"""Validated ResumeSchema per user, reused until the resume changes.
+
+Application detail reads are polled while a run is in progress, and each one
+used to validate the whole resume JSON again. Entries are keyed by
+``Resume.updated_at``: a request that sees a newer timestamp misses, loads
+the JSON and replaces the entry, so an edit is never served stale. Each
+process keeps its own, bounded by RESUME_SCHEMA_CACHE_SIZE users.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from uuid import UUID
+from schemas import ResumeSchema
+from config import settings
+
+_entries: OrderedDict[UUID, tuple[datetime, ResumeSchema]] = OrderedDict()
+hits = 0
+misses = 0
+
+
+def get(user_id: UUID, updated_at: datetime | None) -> ResumeSchema | None:
+    global hits, misses
+    entry = _entries.get(user_id)
+    if entry is None or entry[0] != updated_at:
+        misses += 1
+        return None
+    hits += 1
+    _entries.move_to_end(user_id)
+    return entry[1]
+
+
+def put(user_id: UUID, updated_at: datetime, resume_json: dict) -> ResumeSchema:
+    """Validates ``resume_json`` and keeps it for ``user_id``. The schema is
+    shared between requests, so callers must not modify it."""
+    resume = ResumeSchema(**resume_json)
+    _entries[user_id] = (updated_at, resume)
+    _entries.move_to_end(user_id)
+    while len(_entries) > settings.RESUME_SCHEMA_CACHE_SIZE:
+        _entries.popitem(last=False)
+    return resume
+
+
+def stats() -> dict:
+    return {"entries": len(_entries), "hits": hits, "misses": misses}
@@ -0,0 +1,181 @@
+"""Runs queued tailoring jobs outside the API process.
+
+    python worker.py --concurrency 4
+
+Start as many workers as the load needs. Each one claims jobs from the shared
+jobs table (see utils/jobs.py) and runs up to ``--concurrency`` at a time. The
+API only enqueues them when TAILOR_RUNNER=queue. Set PROGRESS_BACKEND=postgres
+on both sides so the progress published here reaches the API's SSE clients.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+from langgraph.types import Command
+from agent.checkpointer import open_checkpointer, close_checkpointer
+from agent.graph import tailor_agent
+from db import SessionLocal, session_scope, async_engine, init_db
+from models import Application, ApplicationStatus
+from routes.applications import graph_stream
+from schemas import ResumeSchema, JDResponseSchema
+from utils import jobs, progress
+from utils.pool_monitor import current_owner
+from config import settings
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def graph_input(job, config: dict):
+    """The graph input for a job. A retry continues from the last checkpoint
+    instead of starting the run over or replaying a resume that already landed."""
+    payload = job.payload
+    if job.attempts > 1:
+        state = await tailor_agent.aget_state(config)
+        pending = {i.id for i in state.interrupts}
+        if job.kind == "start" and (state.next or state.values):
+            return None
+        if job.kind == "resume" and not pending & payload["resume_map"].keys():
+            return None
+
+    if job.kind == "resume":
+        return Command(resume=payload["resume_map"])
+
+    graph_input = {
+        "raw_html": payload["raw_html"],
+        "resume_json": ResumeSchema(**payload["resume_json"]),
+    }
+    if payload.get("jd_json"):
+        graph_input["jd_json"] = JDResponseSchema(**payload["jd_json"])
+    return graph_input
+
+
+# the queue helpers are synchronous; they run on threads so a slow claim
+# never holds up the runs in flight on this worker's event loop
+def with_session(fn, *args, **kwargs):
+    with SessionLocal(**kwargs) as db:
+        return fn(db, *args)
+
+
+async def keep_alive(job_id, run: asyncio.Task, taken_over: asyncio.Event):
+    """Heartbeats until cancelled. If another worker has taken the job over,
+    sets ``taken_over`` and stops ``run`` so the thread isn't executed twice."""
+    while True:
+        await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+        try:
+            alive = await asyncio.to_thread(
+                with_session, jobs.heartbeat, job_id, WORKER_ID
+            )
+        except Exception as e:
+            # one missed beat is fine; JOB_STALE_SECONDS allows for several
+            print(f"Heartbeat for job {job_id} failed: {e}")
+            continue
+        if not alive:
+            print(f"Job {job_id} was claimed by another worker, stopping its run")
+            taken_over.set()
+            run.cancel()
+            return
+
+
+async def mark_failed(application_id):
+    async with session_scope("worker") as db:
+        app = await db.get(Application, application_id)
+        if not app:
+            return
+        app.status = ApplicationStatus.ERROR
+        app.current_node = None
+        await db.commit()
+    await progress.publish(
+        progress.application_channel(application_id),
+        {"type": "status", "status": ApplicationStatus.ERROR.value, "current_node": None},
+    )
+
+
+async def run_job(job):
+    print(f"Job {job.id} ({job.kind}) for {job.application_id}, attempt {job.attempts}")
+    config = {"configurable": {"thread_id": str(job.application_id)}}
+    # the queue calls below run on threads that inherit this owner
+    current_owner.set(f"job {job.id}")
+    heartbeat = None
+    try:
+        run = asyncio.create_task(
+            graph_stream(
+                await graph_input(job, config),
+                config,
+                application_id=job.application_id,
+                cache_jd=job.payload.get("cache_jd", False),
+            )
+        )
+        taken_over = asyncio.Event()
+        heartbeat = asyncio.create_task(keep_alive(job.id, run, taken_over))
+        try:
+            await run
+        except asyncio.CancelledError:
+            if not taken_over.is_set():
+                raise
+            # the job belongs to the other worker now; leave its row alone
+            return
+        await asyncio.to_thread(with_session, jobs.complete, job.id)
+    except Exception as e:
+        print(f"Job {job.id} failed: {e}")
+        if await asyncio.to_thread(with_session, jobs.fail, job.id, e):
+            await mark_failed(job.application_id)
+    finally:
+        if heartbeat:
+            heartbeat.cancel()
+
+
+async def main(concurrency: int):
+    current_owner.set("worker")
+    init_db()
+    tailor_agent.checkpointer = await open_checkpointer()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    slots = asyncio.Semaphore(concurrency)
+    running: set[asyncio.Task] = set()
+
+    def finished(task):
+        running.discard(task)
+        slots.release()
+
+    print(f"Worker {WORKER_ID} polling with concurrency {concurrency}")
+    try:
+        while not stopping.is_set():
+            await slots.acquire()
+            # keep the claimed attributes loaded once the claim is committed
+            job = await asyncio.to_thread(
+                with_session, jobs.claim, WORKER_ID, expire_on_commit=False
+            )
+            if not job:
+                slots.release()
+                for application_id in await asyncio.to_thread(
+                    with_session, jobs.fail_abandoned
+                ):
+                    await mark_failed(application_id)
+                try:
+                    await asyncio.wait_for(stopping.wait(), settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(run_job(job))
+            running.add(task)
+            task.add_done_callback(finished)
+
+        # runs stop at the next review anyway; let the current ones get there
+        print(f"Worker {WORKER_ID} stopping, waiting for {len(running)} job(s)")
+        await asyncio.gather(*running)
+    finally:
+        await close_checkpointer()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
@@ -1,11 +1,17 @@
-import fetchAPI from "./fetchInstance";
+import fetchAPI, { streamEvents } from "./fetchInstance";
 
-export async function getApplications(token) {
-  const response = await fetchAPI("/applications", {
+// One page of applications, newest first. `cursor` is the nextCursor of the
+// previous page; nextCursor is null on the last one.
+export async function getApplications(token, cursor = null) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const response = await fetchAPI(`/applications${query}`, {
     method: "GET",
     headers: { Authorization: `Bearer ${token}` },
   });
-  return response.json();
+  return {
+    applications: await response.json(),
+    nextCursor: response.headers.get("X-Next-Cursor"),
+  };
 }
 
 export async function getApplication(token, application_id) {
@@ -59,3 +65,14 @@ export async function deleteApplication(token, application_id) {
     },
   });
 }
+
+// Rewrites in progress, bullet by bullet, until `signal` aborts.
+export function streamApplication(token, application_id, onEvent, signal) {
+  return streamEvents(`/applications/${application_id}/stream`, token, onEvent, signal);
+}
+
+// Progress of a run: a snapshot first, then node, step, interrupt, status and
+// complete events, until `signal` aborts.
+export function streamApplicationEvents(token, application_id, onEvent, signal) {
+  return streamEvents(`/applications/${application_id}/events`, token, onEvent, signal);
+}
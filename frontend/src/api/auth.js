@@ -18,7 +18,8 @@ export async function loginUser({ email, password }) {
     const data = await response.json();
     return data; // Access token
   } catch (err) {
-    throw new Error(err.message || "Login failed");
+    // a busy server answers 503 with a string detail
+    throw new Error(err.detail || err.message || "Login failed");
   }
 }
 
@@ -34,4 +34,31 @@ async function fetchAPI(endpoint, options = {}) {
   }
 }
 
+// Reads server-sent events from `endpoint` until the stream ends or `signal`
+// aborts, calling onEvent with each parsed `data` payload.
+export async function streamEvents(endpoint, token, onEvent, signal) {
+  const response = await fetchAPI(endpoint, {
+    method: "GET",
+    headers: {
+      Authorization: `Bearer ${token}`,
+      Accept: "text/event-stream",
+    },
+    signal,
+  });
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    const messages = buffer.split("\n\n");
+    buffer = messages.pop();
+    for (const message of messages) {
+      const data = message.split("\n").find((line) => line.startsWith("data: "));
+      if (data) onEvent(JSON.parse(data.slice(6)));
+    }
+  }
+}
+
 export default fetchAPI;
@@ -1,4 +1,4 @@
-import fetchAPI from "./fetchInstance";
+import fetchAPI, { streamEvents } from "./fetchInstance";
 
 export async function getResume(token) {
   const response = await fetchAPI("/resume", {
@@ -43,3 +43,8 @@ export async function deleteResume(token) {
     headers: { Authorization: `Bearer ${token}` },
   });
 }
+
+// Parse status of the user's resume, the current one first, until `signal` aborts.
+export function streamResumeEvents(token, onEvent, signal) {
+  return streamEvents("/resume/events", token, onEvent, signal);
+}
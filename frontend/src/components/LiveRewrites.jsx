@@ -0,0 +1,24 @@
+export function LiveRewrites({ rewrites }) {
+  const items = Object.values(rewrites);
+  if (items.length === 0) return null;
+
+  return (
+    <div style={{ display: "flex", flexDirection: "column", gap: 16, margin: "0 0 24px 52px" }}>
+      {items.map((r) => (
+        <div key={r.item}>
+          <p style={{ fontFamily: "'Playfair Display', serif", fontSize: 13, fontWeight: 700, color: "#0f172a", marginBottom: 8 }}>
+            {r.item}
+            {!r.done && (
+              <span style={{ fontSize: 10, fontWeight: 800, letterSpacing: "0.1em", textTransform: "uppercase", color: "#94a3b8", marginLeft: 8 }}>
+                writing…
+              </span>
+            )}
+          </p>
+          {(r.value?.bullets || []).map((b, j) => (
+            <div key={j} style={{ fontSize: 12, color: "#1e293b", background: "#f0fdf4", border: "1px solid #bbf7d0", borderRadius: 11, padding: "8px 12px", marginBottom: 4, lineHeight: 1.6 }}>{b}</div>
+          ))}
+        </div>
+      ))}
+    </div>
+  );
+}
@@ -2,6 +2,9 @@ import { SkillTag } from "./ui/SkillTag";
 
 export function ProjectSelectionContent({ data }) {
   const projects = data.selected_projects || [];
+  const scores = Object.fromEntries(
+    (data.project_ranking || []).map((r) => [r.title, r.score])
+  );
   return (
     <div style={{ display: "flex", flexDirection: "column", gap: 10 }}>
       <p style={{ fontSize: 12, fontWeight: 500, color: "#64748b", marginBottom: 4 }}>
@@ -40,6 +43,11 @@ export function ProjectSelectionContent({ data }) {
           <div>
             <p style={{ fontFamily: "'Playfair Display', serif", fontSize: 13, fontWeight: 700, color: "#0f172a", marginBottom: 6 }}>
               {p.title}
+              {scores[p.title] !== undefined && (
+                <span style={{ fontSize: 11, fontWeight: 500, color: "#94a3b8", marginLeft: 8 }}>
+                  relevance {scores[p.title].toFixed(2)}
+                </span>
+              )}
             </p>
             <div style={{ display: "flex", flexWrap: "wrap", gap: 5 }}>
               {(p.technologies || []).map((t) => <SkillTag key={t} label={t} variant="neutral" />)}
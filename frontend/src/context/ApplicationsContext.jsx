@@ -6,6 +6,7 @@ export const ApplicationsContext = createContext(null);
 
 export function ApplicationsProvider({ children }) {
   const [applications, setApplications] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -15,7 +16,8 @@ export function ApplicationsProvider({ children }) {
     try {
       setLoading(true);
       const response = await api.getApplications(token);
-      setApplications(response);
+      setApplications(response.applications);
+      setNextCursor(response.nextCursor);
     } catch (err) {
       setError(err);
     } finally {
@@ -23,6 +25,17 @@ export function ApplicationsProvider({ children }) {
     }
   }
 
+  async function loadMoreApplications() {
+    if (!nextCursor) return;
+    try {
+      const response = await api.getApplications(token, nextCursor);
+      setApplications((prev) => [...prev, ...response.applications]);
+      setNextCursor(response.nextCursor);
+    } catch (err) {
+      setError(err);
+    }
+  }
+
   useEffect(() => {
     if (!token) return;
     fetchApplications();
@@ -77,7 +90,9 @@ export function ApplicationsProvider({ children }) {
         applications,
         loading,
         error,
+        hasMoreApplications: nextCursor !== null,
         fetchApplications,
+        loadMoreApplications,
         createApplication,
         sendApplicationFeedback,
         updateApplicationStatus,
@@ -27,18 +27,38 @@ export function ResumeProvider({ children }) {
     fetchResume();
   }, [token]);
 
+  // The parse status is pushed while parsing; polling is the fallback.
   useEffect(() => {
     if (!resume || resume.status !== "parsing") return;
 
+    let interval;
     const pollResume = async () => {
       const res = await api.getResume(token);
       setResume(res);
     };
+    const startPolling = () => {
+      pollResume();
+      interval = setInterval(pollResume, 1000);
+    };
 
-    pollResume();
-    const interval = setInterval(pollResume, 1000);
+    const controller = new AbortController();
+    api
+      .streamResumeEvents(
+        token,
+        (event) => {
+          if (event.resume_id === resume.id && event.status !== "parsing") fetchResume();
+        },
+        controller.signal
+      )
+      .then(startPolling)
+      .catch((err) => {
+        if (err.name !== "AbortError") startPolling();
+      });
 
-    return () => clearInterval(interval);
+    return () => {
+      controller.abort();
+      clearInterval(interval);
+    };
   }, [resume?.status, token]);
 
   async function parseResume(resumeFile) {
@@ -16,6 +16,7 @@ import { Sidebar } from "../components/Sidebar";
 import { StepRow } from "../components/StepRow";
 import { CompleteBanner } from "../components/CompleteBanner";
 import { InterruptPanel } from "../components/InterruptPanel";
+import { LiveRewrites } from "../components/LiveRewrites";
 
 // ─── Constants ────────────────────────────────────────────────────
 
@@ -29,7 +30,7 @@ const NODE_META = {
   assemble_resume_node: { label: "Assembling resume" },
 };
 
-const TERMINAL_STATUSES = ["tailored", "interrupted", "failed", "applied", "interviewing", "rejected"];
+const TERMINAL_STATUSES = ["tailored", "interrupted", "failed", "error", "applied", "interviewing", "rejected"];
 const POST_TAILOR_STATUSES = ["tailored", "applied", "interviewing", "rejected"];
 
 // ─── Main component ───────────────────────────────────────────────
@@ -42,8 +43,11 @@ export default function ApplicationDetail() {
   const [application, setApplication] = useState(null);
   const [loading, setLoading] = useState(true);
   const [isSubmitting, setIsSubmitting] = useState(false);
+  const [liveRewrites, setLiveRewrites] = useState({});
 
   const intervalRef = useRef(null);
+  const applicationRef = useRef(null);
+  applicationRef.current = application;
 
   async function fetchApplication() {
     try {
@@ -57,6 +61,7 @@ export default function ApplicationDetail() {
     }
   }
 
+  // Fallback for when the progress stream can't be opened.
   function startPolling() {
     clearInterval(intervalRef.current);
     intervalRef.current = setInterval(async () => {
@@ -67,14 +72,77 @@ export default function ApplicationDetail() {
     }, 2000);
   }
 
+  function handleProgress(event) {
+    const { type, refetch, step, steps, ...fields } = event;
+    const current = applicationRef.current;
+
+    if (type === "snapshot") {
+      // anything that happened before the stream opened
+      const stale =
+        !current ||
+        current.status !== fields.status ||
+        current.current_node !== fields.current_node ||
+        (current.steps || []).length !== steps;
+      if (stale) fetchApplication();
+      return;
+    }
+    if (type === "complete" || refetch) {
+      fetchApplication();
+      return;
+    }
+    setApplication((prev) => ({
+      ...prev,
+      ...fields,
+      steps: step ? [...(prev.steps || []).filter((s) => s.id !== step.id), step] : prev.steps,
+    }));
+  }
+
   useEffect(() => {
     if (!id || !token) return;
-    fetchApplication().then((app) => {
-      if (app && !TERMINAL_STATUSES.includes(app.status)) startPolling();
-    });
+    fetchApplication();
     return () => clearInterval(intervalRef.current);
   }, [id, token]);
 
+  // Progress is pushed while the run is live; terminal statuses close the stream.
+  const isLive = !!application && !TERMINAL_STATUSES.includes(application.status);
+  useEffect(() => {
+    if (!id || !token || !isLive) return;
+    clearInterval(intervalRef.current);
+    const controller = new AbortController();
+    api
+      .streamApplicationEvents(token, id, handleProgress, controller.signal)
+      .then(startPolling)
+      .catch((err) => {
+        if (err.name === "AbortError") return;
+        console.error(err);
+        startPolling();
+      });
+    return () => controller.abort();
+  }, [id, token, isLive]);
+
+  // Rewrites stream in bullet by bullet while the run is tailoring.
+  const isStreaming = application?.status === "tailoring";
+  useEffect(() => {
+    if (!id || !token || !isStreaming) return;
+    setLiveRewrites({});
+    const controller = new AbortController();
+    api
+      .streamApplication(
+        token,
+        id,
+        (event) => {
+          // too big for NOTIFY: the finished rewrite arrives with the review anyway
+          if (!event.item) return;
+          setLiveRewrites((prev) => ({ ...prev, [event.item]: event }));
+        },
+        controller.signal
+      )
+      .catch((err) => {
+        if (err.name !== "AbortError") console.error(err);
+      });
+    return () => controller.abort();
+  }, [id, token, isStreaming]);
+
   async function handleFeedback(feedback) {
     setIsSubmitting(true);
     try {
@@ -85,7 +153,6 @@ export default function ApplicationDetail() {
         current_node: null,
         interrupt_payloads: null,
       }));
-      startPolling();
     } catch (err) {
       console.error(err);
     } finally {
@@ -113,7 +180,7 @@ export default function ApplicationDetail() {
 
   const isInterrupted = status === "interrupted";
   const isComplete = POST_TAILOR_STATUSES.includes(status);
-  const isFailed = status === "failed";
+  const isFailed = status === "failed" || status === "error";
   const isTailoring = status === "tailoring";
   const hasActiveNode = current_node && isTailoring;
 
@@ -224,6 +291,8 @@ export default function ApplicationDetail() {
               )}
             </AnimatePresence>
 
+            {isTailoring && <LiveRewrites rewrites={liveRewrites} />}
+
             <AnimatePresence>
               {isInterrupted && interruptPayloads.length > 0 && (
                 <InterruptPanel
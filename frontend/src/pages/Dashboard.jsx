@@ -20,8 +20,14 @@ import { Link, useNavigate } from "react-router";
 import { toast } from "../components/ui/sonner.jsx";
 
 export default function Dashboard() {
-  const { applications, isLoading, createApplication, deleteApplication } =
-    useApplications();
+  const {
+    applications,
+    isLoading,
+    hasMoreApplications,
+    loadMoreApplications,
+    createApplication,
+    deleteApplication,
+  } = useApplications();
   const { resume } = useResume();
   const navigate = useNavigate();
 
@@ -291,6 +297,14 @@ export default function Dashboard() {
           ))}
         </div>
       )}
+
+      {hasMoreApplications && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMoreApplications}>
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
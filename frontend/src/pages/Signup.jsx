@@ -63,7 +63,9 @@ export default function SignupPage() {
       toast.success("Account created successfully!");
       navigate("/login");
     } catch (err) {
-      if (err?.detail) {
+      if (typeof err?.detail === "string") {
+        toast.error(err.detail);
+      } else if (err?.detail) {
         toast.error(Object.values(err.detail));
         setErrors(err.detail ?? {});
       } else {